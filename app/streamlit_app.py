@@ -11,45 +11,90 @@ parent_dir = str(Path(current_dir).resolve().parents[0])
 sys.path.append(parent_dir)
 
 # Import custom functions
-from tab_df.display import display_tab_df_content
+from tab_df.display import display_tab_df_content, load_dataset
 from tab_num.display import display_tab_num_content
 from tab_text.display import display_tab_text_content
 from tab_date.display import display_tab_date_content
 
-# Set Streamlit Page Configuration
-st.set_page_config(
-    page_title="CSV Explorer",
-    page_icon=None,
-    layout="centered",
-    initial_sidebar_state="collapsed",
-)
-
-# Set objects in Streamlit session state
-st.session_state["file_path"] = None
-st.session_state["df"] = None
-st.session_state["dataset"] = None
-st.session_state["selected_num_col"] = None
-st.session_state["num_column"] = None
-st.session_state["selected_text_col"] = None
-st.session_state["text_column"] = None
-st.session_state["selected_date_col"] = None
-st.session_state["date_column"] = None
-
-# Display Title
-st.title("CSV Explorer")
-
-# Add Window to upload CSV file
-with st.expander("ℹ️ - Streamlit application for performing data exploration on a CSV", expanded=True):
-    st.session_state.file_path = st.file_uploader("Choose a CSV file")
-
-# If a CSV file is uploaded, display the different tabs
-if st.session_state.file_path is not None:
-    tab_df, tab_num, tab_text, tab_date = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"])
-    with tab_df:
-        display_tab_df_content(file_path=st.session_state.file_path)
-    with tab_num:
-        display_tab_num_content(df=st.session_state.dataset.df)
-    with tab_text:
-        display_tab_text_content(df=st.session_state.dataset.df)
-    with tab_date:
-        display_tab_date_content(df=st.session_state.dataset.df)
\ No newline at end of file
+
+def main():
+    """
+    --------------------
+    Description
+    --------------------
+    -> main (function): Function that displays the Streamlit application.
+    Streamlit runs this script as __main__, while the worker processes of tab_df.profiling import it under another name when they start, so they do not run the application.
+
+    --------------------
+    Parameters
+    --------------------
+    -> None
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    # Set Streamlit Page Configuration
+    st.set_page_config(
+        page_title="CSV Explorer",
+        page_icon=None,
+        layout="centered",
+        initial_sidebar_state="collapsed",
+    )
+
+    # Set objects in Streamlit session state (only on the first run so that reruns keep them)
+    for key in [
+        "file_path",
+        "streaming",
+        "optimize",
+        "df",
+        "dataset",
+        "selected_num_col",
+        "num_column",
+        "selected_text_col",
+        "text_column",
+        "selected_date_col",
+        "date_column",
+    ]:
+        if key not in st.session_state:
+            st.session_state[key] = None
+
+    # Display Title
+    st.title("CSV Explorer")
+
+    # Add Window to upload CSV file
+    with st.expander("ℹ️ - Streamlit application for performing data exploration on a CSV", expanded=True):
+        st.session_state.file_path = st.file_uploader("Choose a CSV file")
+        st.session_state.streaming = st.checkbox("Low-memory mode: profile the file in chunks without loading it in memory")
+        st.session_state.optimize = st.checkbox("Optimize column types to reduce memory usage", disabled=st.session_state.streaming)
+
+    # If a CSV file is uploaded, display the selected tab
+    # Only the selected tab is computed on each rerun, the results of the other tabs are kept in the caches of utils.cache
+    if st.session_state.file_path is not None:
+        active_tab = st.radio(
+            "Select a tab",
+            ["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"],
+            horizontal=True,
+            key="active_tab",
+            label_visibility="collapsed",
+        )
+        if active_tab == "DataFrame":
+            display_tab_df_content(file_path=st.session_state.file_path, streaming=st.session_state.streaming, optimize=st.session_state.optimize)
+        else:
+            st.session_state.dataset = load_dataset(st.session_state.file_path, streaming=st.session_state.streaming, optimize=st.session_state.optimize)
+            if st.session_state.streaming:
+                display_kwargs = {"dataset": st.session_state.dataset}
+            else:
+                display_kwargs = {"df": st.session_state.dataset.df}
+            if active_tab == "Numeric Serie":
+                display_tab_num_content(**display_kwargs)
+            elif active_tab == "Text Serie":
+                display_tab_text_content(**display_kwargs)
+            else:
+                display_tab_date_content(**display_kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import argparse
+import string
+
+import numpy as np
+import pandas as pd
+
+# Characters of the generated text values
+TEXT_CHARACTERS = np.array(list(string.ascii_letters + string.digits + " "))
+
+# Formats of the generated date columns, "mixed" drawing the format of each value from the other ones
+DATE_FORMATS = {
+    "iso": "%Y-%m-%d",
+    "iso_time": "%Y-%m-%d %H:%M:%S",
+    "day_first": "%d/%m/%Y",
+    "month_name": "%d %b %Y",
+}
+
+# First and last dates of the generated date columns
+DATE_RANGE = ("2000-01-01", "2030-12-31")
+
+
+def generate_values(rng, n_rows, cardinality, make_pool, null_ratio):
+    """
+    --------------------
+    Description
+    --------------------
+    -> generate_values (function): Function that draws the values of a column uniformly from a pool of cardinality distinct values and replaces a share of them by missing values.
+
+    --------------------
+    Parameters
+    --------------------
+    -> rng (np.random.Generator): Random generator
+    -> n_rows (int): Number of values
+    -> cardinality (int): Number of distinct values of the pool
+    -> make_pool (function): Function returning a pool of the given number of distinct values
+    -> null_ratio (float): Share of missing values
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Values as an object array
+    """
+    pool = np.asarray(make_pool(cardinality), dtype=object)
+    values = pool[rng.integers(0, len(pool), n_rows)]
+    values[rng.random(n_rows) < null_ratio] = None
+    return values
+
+
+def make_text_pool(rng, size, string_length):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_text_pool (function): Function that returns distinct random strings whose lengths are drawn between 1 and twice string_length.
+
+    --------------------
+    Parameters
+    --------------------
+    -> rng (np.random.Generator): Random generator
+    -> size (int): Number of strings
+    -> string_length (int): Average length of the strings
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Distinct strings, prefixed by their position so that they never repeat
+    """
+    lengths = rng.integers(1, 2 * string_length + 1, size)
+    characters = "".join(rng.choice(TEXT_CHARACTERS, lengths.sum()))
+    ends = np.cumsum(lengths)
+    return [
+        f"{position}_{characters[end - length:end]}"
+        for position, (length, end) in enumerate(zip(lengths, ends))
+    ]
+
+
+def make_date_pool(rng, size, date_format):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_date_pool (function): Function that returns distinct random dates of DATE_RANGE formatted with one of DATE_FORMATS.
+    Dates are drawn as whole days for the formats without time, and for "mixed", so that every formatted value is distinct.
+    The pool then holds at most one date per day of DATE_RANGE, fewer than size for larger cardinalities (see get_cardinalities).
+
+    --------------------
+    Parameters
+    --------------------
+    -> rng (np.random.Generator): Random generator
+    -> size (int): Number of dates
+    -> date_format (str): Key of DATE_FORMATS, or "mixed" to draw the format of each date
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Formatted dates
+    """
+    unit = "s" if date_format != "mixed" and "%H" in DATE_FORMATS[date_format] else "D"
+    start, end = (pd.Timestamp(date).value // pd.Timedelta(1, unit=unit).value for date in DATE_RANGE)
+    size = min(size, end - start + 1)
+    dates = pd.to_datetime(rng.choice(end - start + 1, size, replace=False) + start, unit=unit)
+    if date_format != "mixed":
+        return list(dates.strftime(DATE_FORMATS[date_format]))
+    formats = rng.integers(0, len(DATE_FORMATS), size)
+    values = np.empty(size, dtype=object)
+    for position, fmt in enumerate(DATE_FORMATS.values()):
+        values[formats == position] = dates[formats == position].strftime(fmt)
+    return list(values)
+
+
+def generate_dataset(n_rows=10000, n_num_cols=2, n_text_cols=2, n_date_cols=1, cardinality=100, string_length=10, null_ratio=0.0, date_format="iso", seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> generate_dataset (function): Function that generates a synthetic dataset for the benchmarks, always the same for the same parameters.
+    Numeric columns alternate between integers and floats, text columns hold random strings and date columns hold dates formatted as date_format.
+    Every column draws its values from a pool of cardinality distinct values, numeric columns included.
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows
+    -> n_num_cols (int): Number of numeric columns
+    -> n_text_cols (int): Number of text columns
+    -> n_date_cols (int): Number of date columns
+    -> cardinality (int): Number of distinct values of each column
+    -> string_length (int): Average length of the text values
+    -> null_ratio (float): Share of missing values in each column
+    -> date_format (str): Key of DATE_FORMATS, or "mixed" to draw the format of each date
+    -> seed (int): Seed of the random generator
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Generated dataset
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for i in range(n_num_cols):
+        if i % 2 == 0:
+            make_pool = lambda size: rng.choice(10 * size, size, replace=False) - 5 * size
+        else:
+            make_pool = lambda size: np.round(rng.normal(0, 1000, size), 3)
+        columns[f"num_{i}"] = pd.to_numeric(pd.Series(generate_values(rng, n_rows, cardinality, make_pool, null_ratio)))
+    for i in range(n_text_cols):
+        columns[f"text_{i}"] = generate_values(rng, n_rows, cardinality, lambda size: make_text_pool(rng, size, string_length), null_ratio)
+    for i in range(n_date_cols):
+        columns[f"date_{i}"] = generate_values(rng, n_rows, cardinality, lambda size: make_date_pool(rng, size, date_format), null_ratio)
+    return pd.DataFrame(columns)
+
+
+def write_dataset(path, **params):
+    """
+    --------------------
+    Description
+    --------------------
+    -> write_dataset (function): Function that generates a synthetic dataset with generate_dataset and writes it as a CSV file.
+
+    --------------------
+    Parameters
+    --------------------
+    -> path (str): Path of the CSV file
+    -> params (dict): Parameters of generate_dataset
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Path of the CSV file
+    """
+    generate_dataset(**params).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic CSV file for the benchmarks")
+    parser.add_argument("path", help="Path of the CSV file to be written")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--num-cols", type=int, default=2)
+    parser.add_argument("--text-cols", type=int, default=2)
+    parser.add_argument("--date-cols", type=int, default=1)
+    parser.add_argument("--cardinality", type=int, default=100)
+    parser.add_argument("--string-length", type=int, default=10)
+    parser.add_argument("--null-ratio", type=float, default=0.0)
+    parser.add_argument("--date-format", choices=list(DATE_FORMATS) + ["mixed"], default="iso")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_dataset(
+        args.path,
+        n_rows=args.rows,
+        n_num_cols=args.num_cols,
+        n_text_cols=args.text_cols,
+        n_date_cols=args.date_cols,
+        cardinality=args.cardinality,
+        string_length=args.string_length,
+        null_ratio=args.null_ratio,
+        date_format=args.date_format,
+        seed=args.seed,
+    )
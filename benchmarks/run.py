@@ -0,0 +1,443 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import utils.storage
+from benchmarks.generate import write_dataset
+from utils.cache import dataset_cache, load_csv
+from tab_df.logics import Dataset
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from tab_date.logics import DateColumn
+
+# Datasets benchmarked by default, as parameters of benchmarks.generate.generate_dataset
+SCENARIOS = {
+    "small": {"n_rows": 10000},
+    "rows_100k": {"n_rows": 100000, "cardinality": 1000},
+    "rows_1m": {"n_rows": 1000000, "cardinality": 1000},
+    "wide": {"n_rows": 50000, "n_num_cols": 25, "n_text_cols": 20, "n_date_cols": 5},
+    "high_cardinality": {"n_rows": 200000, "cardinality": 200000},
+    "long_strings": {"n_rows": 100000, "cardinality": 10000, "string_length": 200},
+    "nulls": {"n_rows": 200000, "cardinality": 1000, "null_ratio": 0.3},
+    "mixed_dates": {"n_rows": 200000, "cardinality": 20000, "date_format": "mixed"},
+}
+
+# Scenarios run when none is given, which finish in a few minutes
+DEFAULT_SCENARIOS = ["small", "rows_100k", "wide", "high_cardinality", "long_strings", "nulls", "mixed_dates"]
+
+# Steps of the set_data() method of each analyzer, in the order it runs them, so that each one can be measured on its own
+ANALYZER_STEPS = {
+    "Dataset": ["set_columns", "set_dimensions", "set_duplicates", "set_missing", "set_numeric", "set_text", "set_table"],
+    "NumericColumn": ["convert_serie_to_num", "set_unique", "set_stats", "set_median", "set_histogram", "set_boxplot", "set_frequent"],
+    "TextColumn": ["convert_serie_to_text", "set_value_counts", "set_missing", "set_empty", "set_char_classes", "set_mode", "set_barchart", "set_frequent"],
+    "DateColumn": ["find_date_cols", "convert_serie_to_date", "set_unique", "set_calendar_stats", "set_barchart", "set_frequent"],
+}
+
+# Relative increase over the baseline above which a measure is reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Increases smaller than these are ignored, as they are within the noise of the measures
+MIN_SECONDS = 0.005
+MIN_PEAK_BYTES = 1024 * 1024
+
+
+def measure(function, repeat=3):
+    """
+    --------------------
+    Description
+    --------------------
+    -> measure (function): Function that measures the duration and the peak memory allocated by a function.
+    The duration is the fastest of repeat runs without tracing, and the peak memory is traced with tracemalloc on one more run, as tracing slows the function down.
+
+    --------------------
+    Parameters
+    --------------------
+    -> function (function): Function without parameters to be measured, run repeat + 1 times
+    -> repeat (int): Number of timed runs
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Duration in seconds and peak memory in bytes
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(durations), "peak_bytes": peak}
+
+
+def make_analyzer(name, df, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_analyzer (function): Function that creates an analyzer of the dataframe, ready to run the steps of ANALYZER_STEPS one by one.
+    The dataframe has no fingerprint (see run_scenario), so nothing is read from or written to the caches of utils.cache.
+    The serie of a DateColumn is the raw text column, which the find_date_cols step detects and convert_serie_to_date then parses with the detected format.
+
+    --------------------
+    Parameters
+    --------------------
+    -> name (str): Key of ANALYZER_STEPS
+    -> df (pd.DataFrame): Benchmarked dataframe
+    -> col_name (str): Name of the benchmarked column, None for Dataset
+
+    --------------------
+    Returns
+    --------------------
+    -> (object): Analyzer
+    """
+    if name == "Dataset":
+        analyzer = Dataset(df=df)
+    else:
+        analyzer = {"NumericColumn": NumericColumn, "TextColumn": TextColumn, "DateColumn": DateColumn}[name](df=df)
+        analyzer.serie = df[col_name]
+    return analyzer
+
+
+def run_step(analyzer, step, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> run_step (function): Function that runs one step of ANALYZER_STEPS on an analyzer.
+
+    --------------------
+    Parameters
+    --------------------
+    -> analyzer (object): Analyzer created by make_analyzer
+    -> step (str): Name of the method
+    -> col_name (str): Name of the benchmarked column
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+    """
+    if isinstance(analyzer, DateColumn) and step == "set_barchart":
+        analyzer.set_barchart(col_name, analyzer.df)
+    else:
+        getattr(analyzer, step)()
+
+
+def benchmark_analyzer(name, df, col_name, repeat=3):
+    """
+    --------------------
+    Description
+    --------------------
+    -> benchmark_analyzer (function): Function that measures every step of ANALYZER_STEPS of an analyzer, then its set_data() method end to end.
+    Each step is measured on an analyzer on which the previous steps have already run, as set_data() does, and restarting from a copy of this state on every run
+    so that a step never finds its own results from a previous run (lists, dictionaries and sets are copied as steps such as find_date_cols fill them in place).
+    The end-to-end run of a DateColumn includes find_date_cols, as the app detects the date columns before calling set_data().
+
+    --------------------
+    Parameters
+    --------------------
+    -> name (str): Key of ANALYZER_STEPS
+    -> df (pd.DataFrame): Benchmarked dataframe
+    -> col_name (str): Name of the benchmarked column, None for Dataset
+    -> repeat (int): Number of timed runs of each measure
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Measures of measure() keyed by step name, and by "set_data" for the end-to-end run
+    """
+    results = {}
+    analyzer = make_analyzer(name, df, col_name)
+    for step in ANALYZER_STEPS[name]:
+        state = dict(analyzer.__dict__)
+
+        def run():
+            analyzer.__dict__.clear()
+            analyzer.__dict__.update({
+                attribute: value.copy() if isinstance(value, (list, dict, set)) else value
+                for attribute, value in state.items()
+            })
+            run_step(analyzer, step, col_name)
+
+        results[step] = measure(run, repeat)
+
+    def run_set_data():
+        new_analyzer = make_analyzer(name, df, col_name)
+        if name == "Dataset":
+            new_analyzer.set_data()
+        else:
+            # The app detects the date columns before profiling one of them
+            if name == "DateColumn":
+                new_analyzer.find_date_cols()
+            new_analyzer.set_data(col_name)
+
+    results["set_data"] = measure(run_set_data, repeat)
+    return results
+
+
+def find_columns(df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_columns (function): Function that picks the first column of each type of a generated dataset, by the prefix of its name (see benchmarks.generate.generate_dataset).
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Generated dataframe
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Name of the benchmarked column of each analyzer, None for Dataset
+    """
+    columns = {"Dataset": None}
+    for name, prefix in [("NumericColumn", "num_"), ("TextColumn", "text_"), ("DateColumn", "date_")]:
+        matching = [col for col in df.columns if col.startswith(prefix)]
+        if matching:
+            columns[name] = matching[0]
+    return columns
+
+
+def get_cardinalities(df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_cardinalities (function): Function that counts the distinct values of every column of a generated dataset, which can be lower than the requested cardinality
+    (a pool of dates holds at most one date per day of benchmarks.generate.DATE_RANGE, and a column with few rows cannot hold its whole pool).
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Generated dataframe
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Number of distinct values keyed by column name
+    """
+    return {col_name: int(df[col_name].nunique()) for col_name in df.columns}
+
+
+def measure_load(path, repeat=3):
+    """
+    --------------------
+    Description
+    --------------------
+    -> measure_load (function): Function that measures how long utils.cache.load_csv takes to load a CSV file as the app does, with pd.read_csv() on its own for reference.
+    The cold load starts from an empty dataset_cache and an empty SNAPSHOT_DIR, so it parses the file and writes its Parquet snapshot and Arrow file.
+    The warm load starts from an empty dataset_cache only, so it maps the Arrow file written by a previous load, as a new process of the app would.
+
+    --------------------
+    Parameters
+    --------------------
+    -> path (str): Path of the CSV file
+    -> repeat (int): Number of timed runs of each measure
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Measures of measure() keyed by "read_csv", "load_csv_cold" and "load_csv_warm"
+    """
+    def load_cold():
+        dataset_cache.clear()
+        shutil.rmtree(utils.storage.SNAPSHOT_DIR, ignore_errors=True)
+        load_csv(path)
+
+    def load_warm():
+        dataset_cache.clear()
+        load_csv(path)
+
+    results = {"read_csv": measure(lambda: pd.read_csv(path, on_bad_lines="skip"), repeat)}
+    results["load_csv_cold"] = measure(load_cold, repeat)
+    results["load_csv_warm"] = measure(load_warm, repeat)
+    return results
+
+
+def run_scenario(params, directory, repeat=3):
+    """
+    --------------------
+    Description
+    --------------------
+    -> run_scenario (function): Function that writes the CSV file of a scenario, measures how long it takes to load with measure_load,
+    and benchmarks every analyzer with benchmark_analyzer on the dataframe returned by load_csv, with the data types the app profiles (Arrow-backed strings for text columns).
+    SNAPSHOT_DIR points to a folder of directory while the scenario runs, so that the files of the app cache are neither read nor left behind.
+    The fingerprint is removed from the attributes of the dataframe, so that the analyzers compute their results on every run instead of reading them from profile_cache.
+
+    --------------------
+    Parameters
+    --------------------
+    -> params (dict): Parameters of benchmarks.generate.generate_dataset
+    -> directory (str): Directory where the CSV file and the app cache are written
+    -> repeat (int): Number of timed runs of each measure
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Measures keyed by analyzer name and then by step name, with the loads under "load", and real cardinality of each column (see get_cardinalities)
+    """
+    path = write_dataset(os.path.join(directory, "benchmark.csv"), **params)
+    snapshot_dir = utils.storage.SNAPSHOT_DIR
+    utils.storage.SNAPSHOT_DIR = os.path.join(directory, "cache")
+    try:
+        results = {"load": measure_load(path, repeat)}
+        df = load_csv(path)[1].copy(deep=False)
+        df.attrs = {}
+        for name, col_name in find_columns(df).items():
+            results[name] = benchmark_analyzer(name, df, col_name, repeat)
+        cardinalities = get_cardinalities(df)
+    finally:
+        dataset_cache.clear()
+        utils.storage.SNAPSHOT_DIR = snapshot_dir
+    return results, cardinalities
+
+
+def get_environment():
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_environment (function): Function that describes the machine and the versions of the libraries, saved with the results as measures are only comparable on the same setup.
+
+    --------------------
+    Parameters
+    --------------------
+    -> None
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Description of the environment
+    """
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compare_results (function): Function that compares the measures of a run with a baseline saved by a previous run.
+    A measure is a regression when it is more than tolerance above the baseline and the increase is above MIN_SECONDS or MIN_PEAK_BYTES.
+    Measures missing from either run are ignored.
+
+    --------------------
+    Parameters
+    --------------------
+    -> results (dict): Results of the run, as saved in the JSON file
+    -> baseline (dict): Results of the baseline, as saved in the JSON file
+    -> tolerance (float): Relative increase above which a measure is a regression
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): One row per compared measure with the columns Scenario, Analyzer, Step, Measure, Baseline, Current, Change and Regression
+    """
+    rows = []
+    for scenario, analyzers in results["scenarios"].items():
+        for analyzer, steps in analyzers.items():
+            for step, measures in steps.items():
+                reference = baseline.get("scenarios", {}).get(scenario, {}).get(analyzer, {}).get(step)
+                if reference is None:
+                    continue
+                for measure_name, minimum in [("seconds", MIN_SECONDS), ("peak_bytes", MIN_PEAK_BYTES)]:
+                    current, previous = measures[measure_name], reference[measure_name]
+                    change = (current - previous) / previous if previous else 0.0
+                    rows.append({
+                        "Scenario": scenario,
+                        "Analyzer": analyzer,
+                        "Step": step,
+                        "Measure": measure_name,
+                        "Baseline": previous,
+                        "Current": current,
+                        "Change": round(change, 3),
+                        "Regression": change > tolerance and current - previous > minimum,
+                    })
+    return pd.DataFrame(rows, columns=["Scenario", "Analyzer", "Step", "Measure", "Baseline", "Current", "Change", "Regression"])
+
+
+def main(argv=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> main (function): Function that runs the benchmarks from the command line, saves their results as JSON and compares them with a baseline if one is given.
+    It exits with status 1 if a regression is found, so that it can be used in a CI job.
+
+    --------------------
+    Parameters
+    --------------------
+    -> argv (list): Command line arguments (default set to None for sys.argv)
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the analyzers of the CSV Explorer on synthetic datasets")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=DEFAULT_SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of each measure, the fastest is kept")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON file where the results are saved")
+    parser.add_argument("--baseline", help="Path of the JSON results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Relative increase above which a measure is a regression")
+    args = parser.parse_args(argv)
+    # Date parsing warns about ambiguous formats on the mixed dates scenario, which would hide the results
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    results = {"environment": get_environment(), "scenarios": {}, "cardinalities": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario in args.scenarios:
+            print(f"Running {scenario}...", flush=True)
+            results["scenarios"][scenario], results["cardinalities"][scenario] = run_scenario(SCENARIOS[scenario], directory, args.repeat)
+            cardinalities = ", ".join(f"{col_name} {n_unique}" for col_name, n_unique in results["cardinalities"][scenario].items())
+            print(f"  Distinct values: {cardinalities}")
+            for analyzer, steps in results["scenarios"][scenario].items():
+                for step, measures in steps.items():
+                    print(f"  {analyzer}.{step}: {measures['seconds']:.4f}s, peak {measures['peak_bytes'] / 1024 / 1024:.1f} MiB")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get("environment") != results["environment"]:
+        print("Warning: the baseline was measured on a different environment")
+    comparison = compare_results(results, baseline, args.tolerance)
+    regressions = comparison[comparison["Regression"]]
+    if regressions.empty:
+        print("No regression found")
+        return 0
+    print("Regressions found:")
+    print(regressions.to_string(index=False))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
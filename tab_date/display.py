@@ -2,7 +2,7 @@ import streamlit as st
 
 from tab_date.logics import DateColumn
 
-def display_tab_date_content(file_path=None, df=None):
+def display_tab_date_content(file_path=None, df=None, dataset=None):
     """
     --------------------
     Description
@@ -12,14 +12,17 @@ def display_tab_date_content(file_path=None, df=None):
     Once the user select a datetime column from the select box, it will call the tab_date.logics.DateColumn.set_data() method in order to compute all the information to be displayed.
     Then it will display a Streamlit Expander container with the following contents:
     - the results of tab_date.logics.DateColumn.get_summary() as a Streamlit Table
+    - the results of tab_date.logics.DateColumn.get_parse_report() as a Streamlit Table
     - the graph from tab_date.logics.DateColumn.histogram using Streamlit.altair_chart()
     - the results of tab_date.logics.DateColumn.frequent using Streamlit.write
+    If a tab_df.streaming.StreamingDataset is provided, the results of its chunked profile are displayed instead and the bar chart is skipped.
  
     --------------------
     Parameters
     --------------------
     -> file_path (str): File path to uploaded CSV file (optional)
     -> df (pd.DataFrame): Loaded dataframe (optional)
+    -> dataset (StreamingDataset): Dataset profiled chunk by chunk (optional)
 
     --------------------
     Returns
@@ -27,7 +30,9 @@ def display_tab_date_content(file_path=None, df=None):
     -> None
 
     """
-    if file_path is not None:
+    if dataset is not None:
+        date_col = DateColumn()
+    elif file_path is not None:
         date_col = DateColumn(file_path=file_path)
     elif df is not None:
         date_col = DateColumn(df=df)
@@ -36,20 +41,32 @@ def display_tab_date_content(file_path=None, df=None):
         return
     
     st.session_state["date_colum"] = date_col
-    date_col.find_date_cols()
+    if dataset is not None:
+        date_col.cols_list = dataset.date_cols_list
+    else:
+        date_col.find_date_cols()
   
 #   Check for empty list if not then proceed
     if len(date_col.cols_list) !=0 :
         selected_col = st.selectbox("Which date column do you want to explore", date_col.cols_list, key="date_col_selector")
-        date_col.set_data(selected_col)
+        if dataset is not None:
+            dataset.set_column(date_col, selected_col)
+        else:
+            date_col.set_data(selected_col)
    
         with st.expander("Date Column", expanded=True):
             summary_df = date_col.get_summary()
             st.table(summary_df)
 
+            report_df = date_col.get_parse_report()
+            if report_df is not None:
+                st.subheader("Date Parsing")
+                st.table(report_df)
+
 
-            st.subheader("BarChart")
-            st.altair_chart(date_col.barchart, use_container_width=True)
+            if dataset is None:
+                st.subheader("BarChart")
+                st.altair_chart(date_col.barchart, use_container_width=True)
 
             st.subheader("Most Frequent Values:")
             st.write(date_col.frequent)
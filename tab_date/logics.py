@@ -2,6 +2,12 @@ import pandas as pd
 import altair as alt
 from datetime import datetime
 
+from utils.cache import date_cache, load_columns, load_profile, save_profile
+from utils.dtypes import TEXT_DTYPES
+from utils.sketches import EXACT_FREQUENT_DISTINCT, FrequentItems, count_distinct
+from tab_date.parsing import detect_dates, get_report_table, parse_dates
+from tab_date.stats import compute_calendar_stats, compute_date_histogram
+
 
 class DateColumn:
     """
@@ -15,7 +21,11 @@ class DateColumn:
     --------------------
     -> file_path (str): Path to the uploaded CSV file (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
+    -> approx_distinct (bool): True to count unique values with a HyperLogLog, False to count them exactly, None to only approximate long series (default set to None)
     -> cols_list (list): List of columns names of dataset that are text type (default set to empty list)
+    -> date_formats (dict): Format inferred for each text column detected as dates, None if pandas has to infer it itself (default set to empty dict)
+    -> parsed_cols (dict): Converted serie and parsing report of each text column detected as dates, reused by set_data (default set to empty dict)
+    -> parse_report (dict): Number of rows of the serie parsed with the inferred format, parsed one by one, invalid and missing (see tab_date.parsing.parse_dates) (default set to None)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
     -> n_unique (int): Number of unique value of a serie (optional)
     -> n_missing (int): Number of missing values of a serie (optional)
@@ -31,10 +41,14 @@ class DateColumn:
 
     """
 
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, approx_distinct=None):
         self.file_path = file_path
         self.df = df
+        self.approx_distinct = approx_distinct
         self.cols_list = []
+        self.date_formats = {}
+        self.parsed_cols = {}
+        self.parse_report = None
         self.serie = None
         self.n_unique = None
         self.n_missing = None
@@ -56,8 +70,10 @@ class DateColumn:
         -> find_date_cols (method): Class method that will load the uploaded CSV file
         as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
         Then it will find all columns of datetime data type.
-        If it can't find any datetime then it will look for all columns of text time.
-        Then it will store the results in the relevant attribute (self.cols_list).
+        If it can't find any datetime then it will look for all columns of text time that can be converted to datetime,
+        testing a sample of each column first (see tab_date.parsing.detect_dates).
+        Then it will store the results in the relevant attributes (self.cols_list, self.date_formats and self.parsed_cols).
+        The detected columns and their converted series are kept in date_cache so that reruns and set_data() do not parse them again.
 
         --------------------
         Parameters
@@ -71,20 +87,56 @@ class DateColumn:
 
         """
         if self.df is None:
-            self.df = pd.read_csv(self.file_path)
+            self.df = load_columns(self.file_path, include=["datetime64[ns]"] + TEXT_DTYPES)[1]
 
         for col in self.df.columns:
             if self.df[col].dtype == "datetime64[ns]":
                 self.cols_list.append(col)
 
         if not self.cols_list:
-            for col in self.df.columns:
-                if self.df[col].dtype == "object":
-                    try:
-                        pd.to_datetime(self.df[col])
-                        self.cols_list.append(col)
-                    except ValueError:
-                        pass
+            fingerprint = self.df.attrs.get("fingerprint")
+            detected = date_cache.get((fingerprint, "formats")) if fingerprint else None
+            if detected is not None:
+                self.date_formats = dict(detected)
+                self.cols_list = list(detected)
+                return
+
+            for col in self.df.select_dtypes(include=TEXT_DTYPES).columns:
+                dates = detect_dates(self.df[col])
+                if dates is not None:
+                    self.cols_list.append(col)
+                    self.date_formats[col] = dates[1]["format"]
+                    self.parsed_cols[col] = dates
+                    if fingerprint:
+                        date_cache.put((fingerprint, "parsed", col), self.parsed_cols[col])
+            if fingerprint:
+                date_cache.put((fingerprint, "formats"), dict(self.date_formats))
+
+    def get_parsed_col(self, col_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_parsed_col (method): Class method that returns the converted serie and parsing report of a text column found by find_date_cols(),
+        from self.parsed_cols or from date_cache.
+
+        --------------------
+        Parameters
+        --------------------
+        -> col_name (str): Name of the date column
+
+        --------------------
+        Returns
+        --------------------
+        -> (tuple): Converted serie and parsing report, or None if they have not been kept
+
+        """
+        if col_name in self.parsed_cols:
+            return self.parsed_cols[col_name]
+        fingerprint = self.df.attrs.get("fingerprint") if self.df is not None else None
+        if fingerprint:
+            return date_cache.get((fingerprint, "parsed", col_name))
+        return None
 
     def set_data(self, col_name):
         """
@@ -111,19 +163,19 @@ class DateColumn:
 
         if self.df is not None:
             if col_name in self.df.columns:
-                self.serie = self.df[col_name]
-                self.convert_serie_to_date()
+                if load_profile(self, col_name):
+                    return
+                parsed = self.get_parsed_col(col_name)
+                if parsed is not None:
+                    self.serie, self.parse_report = parsed
+                else:
+                    self.serie = self.df[col_name]
+                    self.convert_serie_to_date()
                 self.set_unique()
-                self.set_missing()
-                self.set_weekend()
-                self.set_weekday()
-                self.set_future()
-                self.set_empty_1900()
-                self.set_empty_1970()
-                self.set_min()
-                self.set_max()
+                self.set_calendar_stats()
                 self.set_barchart(col_name, self.df)
                 self.set_frequent()
+                save_profile(self, col_name)
 
     def convert_serie_to_date(self):
         """
@@ -132,7 +184,9 @@ class DateColumn:
         --------------------
         -> convert_serie_to_date (method): Class method that convert a
         Pandas Series to datetime data type and store
-        the results in the relevant attribute (self.serie).
+        the results in the relevant attributes (self.serie and self.parse_report).
+        Each unique value is parsed only once, with the format found by find_date_cols() or inferred from a sample,
+        and only the values that do not match it are parsed one by one (see tab_date.parsing.parse_dates).
 
         --------------------
         Parameters
@@ -146,7 +200,7 @@ class DateColumn:
 
         """
         if self.is_serie_none():
-            self.serie = pd.to_datetime(self.serie, errors="coerce")
+            self.serie, self.parse_report = parse_dates(self.serie, self.date_formats.get(self.serie.name))
 
     def is_serie_none(self):
         """
@@ -179,6 +233,34 @@ class DateColumn:
         -> set_unique (method): Class method that
         computes the number of unique value of a serie and
         store the results in the relevant attribute(self.n_unique).
+        The count is estimated with a HyperLogLog for long series
+        or when self.approx_distinct is True (see utils.sketches.count_distinct).
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.is_serie_none():
+            # Missing dates count as one more unique value, as with len(self.serie.unique())
+            self.n_unique = count_distinct(self.serie, approximate=self.approx_distinct) + int(self.serie.isna().any())
+
+    def set_calendar_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_calendar_stats (method): Class method that computes in a single pass over the serie (see tab_date.stats.compute_calendar_stats)
+        the number of missing, weekend, weekday, future, '1900-01-01' and '1970-01-01' dates and the minimum and maximum dates,
+        and store the results in the relevant attributes (self.n_missing, self.n_weekend, self.n_weekday, self.n_future,
+        self.n_empty_1900, self.n_empty_1970, self.col_min and self.col_max).
+        It gives the same results as set_missing(), set_weekend(), set_weekday(), set_future(), set_empty_1900(), set_empty_1970(), set_min() and set_max().
 
         --------------------
         Parameters
@@ -192,7 +274,15 @@ class DateColumn:
 
         """
         if self.is_serie_none():
-            self.n_unique = len(self.serie.unique())
+            stats = compute_calendar_stats(self.serie)
+            self.n_missing = stats["n_missing"]
+            self.n_weekend = stats["n_weekend"]
+            self.n_weekday = stats["n_weekday"]
+            self.n_future = stats["n_future"]
+            self.n_empty_1900 = stats["n_empty_1900"]
+            self.n_empty_1970 = stats["n_empty_1970"]
+            self.col_min = stats["col_min"]
+            self.col_max = stats["col_max"]
 
     def set_missing(self):
         """
@@ -260,7 +350,7 @@ class DateColumn:
 
         """
         if self.is_serie_none():
-            self.col_min = self.serie.max()
+            self.col_max = self.serie.max()
 
     def set_weekend(self):
         """
@@ -306,7 +396,7 @@ class DateColumn:
         """
         if self.is_serie_none():
             day_of_week = self.serie.dt.dayofweek
-            self.n_weekday = ((day_of_week != 5) & (day_of_week != 6)).sum()
+            self.n_weekday = (day_of_week < 5).sum()
 
     def set_future(self):
         """
@@ -376,7 +466,7 @@ class DateColumn:
 
         """
         if self.is_serie_none():
-            self.n_empty_1900 = (self.serie == pd.to_datetime("1970-01-01")).sum()
+            self.n_empty_1970 = (self.serie == pd.to_datetime("1970-01-01")).sum()
 
     def set_barchart(self, col_name, df):
         """
@@ -384,8 +474,10 @@ class DateColumn:
         Description
         --------------------
         -> set_barchart (method): Class method that computes
-        the Altair barchart displaying the count for each value of a serie
+        the Altair barchart displaying the count of dates per time bucket of a serie
         and store the results in the relevant attribute(self.barchart).
+        The bucket (minute, hour, day, week, month...) is chosen from the range and the number of dates
+        and the counts are aggregated before being sent to Altair (see tab_date.stats.compute_date_histogram).
 
         --------------------
         Parameters
@@ -400,14 +492,14 @@ class DateColumn:
         """
 
         if self.is_serie_none():
-            value_counts = self.df[col_name].value_counts().reset_index()
-            value_counts.columns = ["Date", "Count"]
+            value_counts, bucket = compute_date_histogram(self.serie)
+            title = "Barchart" if bucket is None else f"Barchart (count per {bucket})"
 
             chart = (
                 alt.Chart(value_counts)
                 .mark_bar()
-                .encode(x=alt.X("Date", sort="-y"), y="Count")
-                .properties(title="Barchart")
+                .encode(x=alt.X("Date:T"), y="Count")
+                .properties(title=title)
             )
             self.barchart = chart
 
@@ -419,6 +511,9 @@ class DateColumn:
         -> set_frequent (method): Class method that
         computes the Dataframe containing the most frequest value of a serie
         and store the results in the relevant attribute(self.frequent).
+        Columns with more than EXACT_FREQUENT_DISTINCT unique values use a bounded
+        FrequentItems summary (utils.sketches) instead of a full value_counts(),
+        and the Dataframe gets a max_error column with the maximum overestimation of each occurrence.
 
         --------------------
         Parameters
@@ -433,7 +528,13 @@ class DateColumn:
 
         """
 
-        if self.is_serie_none():
+        if self.is_serie_none() and self.n_unique is not None and self.n_unique > EXACT_FREQUENT_DISTINCT:
+            top = FrequentItems()
+            top.update(self.serie)
+            frequent = top.get_top(end)
+            frequent.insert(2, "percentage", frequent["occurrence"] / self.serie.count() * 100)
+            self.frequent = frequent
+        elif self.is_serie_none():
             value_counts = self.serie.value_counts()
             self.frequent["value"] = value_counts.index
             self.frequent["occurrence"] = value_counts.values
@@ -487,3 +588,26 @@ class DateColumn:
         ]
         df_summry = pd.DataFrame({"Description": summry_title, "Value": summry_value}, dtype="string")
         return df_summry
+
+    def get_parse_report(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_parse_report (method): Class method that formats the number of rows that went through each parsing path of
+        convert_serie_to_date() as a Pandas dataframe with 2 columns: Parsing Path and Rows
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Formatted dataframe to be displayed on the Streamlit app, or None if the serie has not been parsed
+
+        """
+        if self.parse_report is None:
+            return None
+        return get_report_table(self.parse_report)
@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# Number of values taken from the start and from random rows of a column to test whether it contains dates
+DETECTION_SAMPLE_ROWS = 1000
+
+# Number of values used to guess the format of a date column
+FORMAT_SAMPLE_ROWS = 20
+
+
+def sample_values(serie, n=DETECTION_SAMPLE_ROWS, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> sample_values (function): Function that returns the first n non-missing values of a serie followed by n other non-missing values taken at random,
+    so that a column whose first rows look like dates but later rows do not is still likely to be rejected from a sample.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie to be sampled
+    -> n (int): Number of values taken from the start and from random rows of the serie
+    -> seed (int): Seed of the random sample, so that reruns take the same values
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Sampled values
+    """
+    values = serie.dropna()
+    if len(values) <= 2 * n:
+        return values
+    return pd.concat([values.iloc[:n], values.iloc[n:].sample(n, random_state=seed)])
+
+
+def infer_date_format(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> infer_date_format (function): Function that guesses the strftime format of a sample of date strings.
+    The format of the first FORMAT_SAMPLE_ROWS values is guessed and the most common one is kept.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (pd.Series): Non-missing values to be inspected
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Guessed format, or None if no value looks like a date with a known format
+    """
+    formats = pd.Series([
+        guess_datetime_format(value)
+        for value in values.iloc[:FORMAT_SAMPLE_ROWS]
+        if isinstance(value, str)
+    ], dtype=object).dropna()
+    if formats.empty:
+        return None
+    return formats.value_counts().index[0]
+
+
+def detect_dates(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> detect_dates (function): Function that checks whether every non-missing value of a column can be converted to datetime with parse_dates.
+    The check is first run on a sample of the column (see sample_values), so that text columns are rejected without parsing all their rows.
+    Only the columns accepted on the sample are parsed in full, with the format inferred from the sample, and the parsed serie is returned to be reused.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Column to be checked
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Converted serie and parsing report of parse_dates, or None if the column does not contain dates
+    """
+    sample = sample_values(serie)
+    try:
+        report = parse_dates(sample)[1]
+        if sample.empty or report["n_invalid"]:
+            return None
+        dates, report = parse_dates(serie, date_format=report["format"])
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if report["n_invalid"]:
+        return None
+    return dates, report
+
+
+def parse_dates(serie, date_format=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_dates (function): Function that converts a Pandas Series to datetime like pd.to_datetime(errors="coerce") and reports how each row was parsed.
+    The serie is dictionary-encoded with pd.factorize() so that each unique value is parsed once, and the dominant format is inferred from a sample (see infer_date_format) if not given.
+    The unique values are first parsed with this fixed format, which is vectorized, and only the values that do not match it are parsed one by one with format="mixed".
+    The results are mapped back to every row through the codes. Values that cannot be parsed become NaT.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie to be converted
+    -> date_format (str): Format of the dates (default set to None to infer it)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Converted serie with the same index and name, and report dictionary with the format used and the number of rows parsed with it (n_format),
+    parsed one by one (n_fallback), that could not be parsed (n_invalid) and missing (n_missing)
+    """
+    report = {"format": date_format, "n_format": 0, "n_fallback": 0, "n_invalid": 0, "n_missing": int(serie.isna().sum())}
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        report["n_format"] = len(serie) - report["n_missing"]
+        return serie, report
+
+    codes, uniques = pd.factorize(serie)
+    if date_format is None:
+        date_format = infer_date_format(sample_values(pd.Series(uniques)))
+        report["format"] = date_format
+    if date_format is None:
+        # Without a format, pandas would parse every value one by one anyway
+        dates = pd.DatetimeIndex(np.full(len(uniques), np.datetime64("NaT"), dtype="datetime64[ns]"))
+    else:
+        dates = pd.to_datetime(uniques, format=date_format, errors="coerce")
+    residue = np.asarray(dates.isna())
+    if residue.any():
+        try:
+            fallback = pd.Series(dates)
+            fallback[residue] = pd.to_datetime(uniques[residue], format="mixed", errors="coerce")
+            dates = pd.DatetimeIndex(fallback)
+        except (ValueError, TypeError):
+            # Dates with different time zones cannot be combined, parse every value with pandas
+            dates = pd.DatetimeIndex(pd.to_datetime(uniques, errors="coerce"))
+            residue = np.ones(len(uniques), dtype=bool)
+
+    # Number of rows behind each unique value, to report the parsing paths by row
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    invalid = np.asarray(dates.isna())
+    report["n_invalid"] = int(counts[invalid].sum())
+    report["n_fallback"] = int(counts[residue & ~invalid].sum())
+    report["n_format"] = int(counts[~residue].sum())
+
+    converted = pd.Series(dates.take(codes, allow_fill=True, fill_value=pd.NaT), index=serie.index, name=serie.name)
+    return converted, report
+
+
+def merge_reports(report, other):
+    """
+    --------------------
+    Description
+    --------------------
+    -> merge_reports (function): Function that adds the row counts of two reports returned by parse_dates for different chunks of the same column.
+
+    --------------------
+    Parameters
+    --------------------
+    -> report (dict): Report of the first chunks, None if there is none yet
+    -> other (dict): Report of the next chunk
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Combined report, keeping the format of the first report
+    """
+    if report is None:
+        return dict(other)
+    return {
+        name: report[name] if name == "format" else report[name] + other[name]
+        for name in report
+    }
+
+
+def get_report_table(report):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_report_table (function): Function that formats a report returned by parse_dates as a Pandas dataframe with 2 columns: Parsing Path and Rows.
+
+    --------------------
+    Parameters
+    --------------------
+    -> report (dict): Report of parse_dates
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Formatted dataframe to be displayed on the Streamlit app
+    """
+    date_format = report["format"] if report["format"] is not None else "no format found"
+    path = [
+        f"Fixed format ({date_format})",
+        "Mixed formats (parsed one by one)",
+        "Could not be parsed",
+        "Missing",
+    ]
+    rows = [report["n_format"], report["n_fallback"], report["n_invalid"], report["n_missing"]]
+    return pd.DataFrame({"Parsing Path": path, "Rows": rows}, dtype="string")
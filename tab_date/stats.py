@@ -0,0 +1,314 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.sketches import ValueCounter
+from tab_date.parsing import merge_reports, parse_dates
+
+# Number of timestamps processed at once by compute_calendar_stats, to bound the size of the temporary arrays
+BLOCK_SIZE = 1024 * 1024
+
+NS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+
+# Maximum number of bars of the date histogram
+MAX_DATE_BUCKETS = 200
+
+# Width of the buckets of the date histogram, from the finest to the coarsest: name, numpy datetime unit and approximate width in nanoseconds
+# Weeks have no numpy unit starting on Monday and are computed from days
+DATE_BUCKETS = (
+    ("second", "s", 10 ** 9),
+    ("minute", "m", 60 * 10 ** 9),
+    ("hour", "h", 60 * 60 * 10 ** 9),
+    ("day", "D", NS_PER_DAY),
+    ("week", None, 7 * NS_PER_DAY),
+    ("month", "M", 30.44 * NS_PER_DAY),
+    ("year", "Y", 365.25 * NS_PER_DAY),
+)
+
+# Integer value of a missing timestamp (NaT) in the int64 representation of datetime64[ns]
+NAT = np.iinfo(np.int64).min
+
+
+def compute_calendar_stats(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_calendar_stats (function): Function that computes in a single pass over the int64 nanosecond representation of a datetime serie
+    the number of missing dates, weekend and weekday dates, dates in the future and dates equal to '1900-01-01' or '1970-01-01', and the minimum and maximum dates.
+    The day of the week is derived from the number of days since 1970-01-01, which was a Thursday, and tallied with np.bincount.
+    The serie is processed by blocks of BLOCK_SIZE timestamps. Time zone aware dates are counted on their local date and time.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie of datetime data type
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Results keyed by the names of the DateColumn attributes: n_missing, n_weekend, n_weekday, n_future, n_empty_1900, n_empty_1970, col_min and col_max
+    """
+    tz = getattr(serie.dt, "tz", None)
+    if tz is not None:
+        serie = serie.dt.tz_localize(None)
+    values = serie.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    future = pd.Timestamp(datetime.now().date()).value
+    empty_1900 = pd.Timestamp("1900-01-01").value
+    empty_1970 = pd.Timestamp("1970-01-01").value
+    day_counts = np.zeros(7, dtype=np.int64)
+    n_future = n_empty_1900 = n_empty_1970 = 0
+    col_min = col_max = None
+
+    for start in range(0, len(values), BLOCK_SIZE):
+        block = values[start:start + BLOCK_SIZE]
+        block = block[block != NAT]
+        if not len(block):
+            continue
+        # 1970-01-01 is a Thursday, so the day of the week (Monday=0) is shifted by 3
+        day_counts += np.bincount((block // NS_PER_DAY + 3) % 7, minlength=7)
+        n_future += int(np.count_nonzero(block > future))
+        n_empty_1900 += int(np.count_nonzero(block == empty_1900))
+        n_empty_1970 += int(np.count_nonzero(block == empty_1970))
+        block_min, block_max = int(block.min()), int(block.max())
+        col_min = block_min if col_min is None else min(col_min, block_min)
+        col_max = block_max if col_max is None else max(col_max, block_max)
+
+    n_valid = int(day_counts.sum())
+    if col_min is not None:
+        col_min = pd.Timestamp(col_min, tz=None)
+        col_max = pd.Timestamp(col_max, tz=None)
+        if tz is not None:
+            col_min, col_max = col_min.tz_localize(tz), col_max.tz_localize(tz)
+    return {
+        "n_missing": len(values) - n_valid,
+        "n_weekend": int(day_counts[5:].sum()),
+        "n_weekday": int(day_counts[:5].sum()),
+        "n_future": n_future,
+        "n_empty_1900": n_empty_1900,
+        "n_empty_1970": n_empty_1970,
+        "col_min": col_min,
+        "col_max": col_max,
+    }
+
+
+def get_date_bucket(col_min, col_max, n_rows, max_buckets=MAX_DATE_BUCKETS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_bucket (function): Function that picks the finest bucket of DATE_BUCKETS (second, minute, hour, day, week, month or year)
+    that splits the range of the dates in at most max_buckets buckets. Short columns get fewer buckets, about the square root of their number of rows,
+    so that each bar still counts several dates.
+
+    --------------------
+    Parameters
+    --------------------
+    -> col_min (pd.Timestamp): Minimum date
+    -> col_max (pd.Timestamp): Maximum date
+    -> n_rows (int): Number of dates to be counted
+    -> max_buckets (int): Maximum number of buckets
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Name of the bucket, numpy datetime unit (None for weeks) and approximate width in nanoseconds
+    """
+    max_buckets = min(max_buckets, max(10, int(np.sqrt(n_rows))))
+    span = col_max.value - col_min.value
+    for bucket in DATE_BUCKETS:
+        if span / bucket[2] < max_buckets:
+            return bucket
+    return DATE_BUCKETS[-1]
+
+
+def compute_date_histogram(serie, max_buckets=MAX_DATE_BUCKETS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_date_histogram (function): Function that counts the dates of a serie per time bucket, with a bucket width chosen by get_date_bucket from the range and the number of dates.
+    Dates are truncated to their bucket on their int64 representation and tallied with np.bincount, so that only one row per bucket is returned,
+    including empty buckets. Time zone aware dates are counted on their local date and time.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie of datetime data type
+    -> max_buckets (int): Maximum number of buckets
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Dataframe with the columns Date (start of each bucket) and Count, and name of the bucket
+    """
+    if getattr(serie.dt, "tz", None) is not None:
+        serie = serie.dt.tz_localize(None)
+    values = serie.dropna().to_numpy(dtype="datetime64[ns]")
+    if not len(values):
+        return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Count": pd.Series(dtype="int64")}), None
+
+    name, unit, width = get_date_bucket(pd.Timestamp(values.min()), pd.Timestamp(values.max()), len(values), max_buckets)
+    if unit is None:
+        # Weeks start on Monday, and 1970-01-05 is the first Monday after the epoch
+        days = values.astype("datetime64[D]").view(np.int64)
+        buckets = (days - 4) // 7
+    else:
+        buckets = values.astype(f"datetime64[{unit}]").view(np.int64)
+
+    first = int(buckets.min())
+    counts = np.bincount(buckets - first)
+    starts = np.arange(first, first + len(counts))
+    if unit is None:
+        dates = (starts * 7 + 4).astype("datetime64[D]")
+    else:
+        dates = starts.astype(f"datetime64[{unit}]")
+    return pd.DataFrame({"Date": dates.astype("datetime64[ns]"), "Count": counts}), name
+
+
+class DateAccumulator:
+    """
+    --------------------
+    Description
+    --------------------
+    -> DateAccumulator (class): Class that builds the DateColumn profile of a date column from the chunks of a tab_df.streaming.StreamingDataset.
+    The format detected on the first chunk is kept in date_format and reused to parse the next chunks with tab_date.parsing.parse_dates, whose reports are merged.
+    The calendar counts of each chunk (see compute_calendar_stats) are added up, and distinct dates are kept in a ValueCounter for the unique count and frequent values.
+    Missing dates are counted apart and, as in DateColumn.set_unique, add one unique value.
+
+    --------------------
+    Attributes
+    --------------------
+    -> n_rows (int): Number of values seen (default set to 0)
+    -> n_missing (int): Number of values that are missing or could not be converted to a date (default set to 0)
+    -> n_weekend (int): Number of dates falling during weekend (default set to 0)
+    -> n_weekday (int): Number of dates not falling during weekend (default set to 0)
+    -> n_future (int): Number of dates falling in the future (default set to 0)
+    -> n_empty_1900 (int): Number of dates equal to '1900-01-01' (default set to 0)
+    -> n_empty_1970 (int): Number of dates equal to '1970-01-01' (default set to 0)
+    -> col_min (pd.Timestamp): Minimum date (default set to None)
+    -> col_max (pd.Timestamp): Maximum date (default set to None)
+    -> values (ValueCounter): Counts of the distinct dates seen so far
+    -> date_format (str): Format inferred on the first chunk and used to parse the next ones (default set to None)
+    -> parse_report (dict): Number of rows that went through each parsing path of tab_date.parsing.parse_dates (default set to None)
+
+    """
+    def __init__(self):
+        self.n_rows = 0
+        self.n_missing = 0
+        self.n_weekend = 0
+        self.n_weekday = 0
+        self.n_future = 0
+        self.n_empty_1900 = 0
+        self.n_empty_1970 = 0
+        self.col_min = None
+        self.col_max = None
+        self.values = ValueCounter()
+        self.date_format = None
+        self.parse_report = None
+
+    def update(self, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that folds a chunk of a column into the accumulator, converting it to datetime as DateColumn does.
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Chunk of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        serie, report = parse_dates(serie, self.date_format)
+        if self.date_format is None:
+            self.date_format = report["format"]
+        stats = compute_calendar_stats(serie)
+
+        other = DateAccumulator()
+        other.n_rows = len(serie)
+        other.n_missing = stats["n_missing"]
+        other.n_weekend = stats["n_weekend"]
+        other.n_weekday = stats["n_weekday"]
+        other.n_future = stats["n_future"]
+        other.n_empty_1900 = stats["n_empty_1900"]
+        other.n_empty_1970 = stats["n_empty_1970"]
+        other.col_min = stats["col_min"]
+        other.col_max = stats["col_max"]
+        other.values.update_counts(serie.value_counts())
+        other.parse_report = report
+        self.merge(other)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another accumulator of the same column into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (DateAccumulator): Accumulator computed on other chunks of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        self.n_rows += other.n_rows
+        self.n_missing += other.n_missing
+        self.n_weekend += other.n_weekend
+        self.n_weekday += other.n_weekday
+        self.n_future += other.n_future
+        self.n_empty_1900 += other.n_empty_1900
+        self.n_empty_1970 += other.n_empty_1970
+        if other.col_min is not None:
+            self.col_min = other.col_min if self.col_min is None else min(self.col_min, other.col_min)
+            self.col_max = other.col_max if self.col_max is None else max(self.col_max, other.col_max)
+        self.values.merge(other.values)
+        if other.parse_report is not None:
+            self.parse_report = merge_reports(self.parse_report, other.parse_report)
+
+    def finalize(self, analyzer, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> finalize (method): Class method that stores the accumulated results in the attributes of a tab_date.logics.DateColumn so that its get_summary() and frequent can be displayed.
+
+        --------------------
+        Parameters
+        --------------------
+        -> analyzer (DateColumn): Analyzer to be filled
+        -> end (int): The maximum number of top values to be kept in analyzer.frequent
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        # As DateColumn.set_unique, missing dates count as one more unique value
+        analyzer.n_unique = self.values.get_n_unique() + (1 if self.n_missing else 0)
+        analyzer.n_missing = self.n_missing
+        analyzer.n_weekend = self.n_weekend
+        analyzer.n_weekday = self.n_weekday
+        analyzer.n_future = self.n_future
+        analyzer.n_empty_1900 = self.n_empty_1900
+        analyzer.n_empty_1970 = self.n_empty_1970
+        analyzer.col_min = self.col_min
+        analyzer.col_max = self.col_max
+        analyzer.parse_report = self.parse_report
+
+        frequent = self.values.get_top(end)
+        frequent.insert(2, "percentage", frequent["occurrence"] / (self.n_rows - self.n_missing) * 100)
+        analyzer.frequent = frequent
@@ -1,8 +1,36 @@
 import streamlit as st
 import pandas as pd
 from tab_df.logics import Dataset
+from tab_df.profiling import prefetch_profiles, profile_dataset
+from tab_df.streaming import load_streaming_dataset
 
-def display_tab_df_content(file_path=None, df=None):
+def load_dataset(file_path, streaming=False, optimize=False):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_dataset (function): Function that returns the dataset of an uploaded CSV file without computing its overview, so that the other tabs can get its dataframe
+    or its chunked profile without running tab_df.logics.Dataset.set_data(). The parsed dataframe and the chunked profile are cached (see utils.cache), so this is cheap on reruns.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): File path to uploaded CSV file
+    -> streaming (bool): Whether to profile the uploaded file chunk by chunk (default set to False)
+    -> optimize (bool): Whether to convert the columns of the uploaded file to smaller data types (default set to False)
+
+    --------------------
+    Returns
+    --------------------
+    -> (Dataset or StreamingDataset): Dataset of the uploaded file
+
+    """
+    if streaming:
+        return load_streaming_dataset(file_path)
+    return Dataset(file_path, optimize=optimize)
+
+
+def display_tab_df_content(file_path=None, df=None, streaming=False, optimize=False):
     """
     --------------------
     Description
@@ -13,12 +41,17 @@ def display_tab_df_content(file_path=None, df=None):
     2. the results of tab_df.logics.Dataset.table using Streamlit.write()
     Finally it will display a second Streamlit Expander container with a slider to select the number of rows to be displayed and a radio button to select the method (head, tail, sample).
     According to the values selected on the slider and radio button, display the subset of the dataframe accordingly using Streamlit.dataframe
+    In low-memory mode (streaming=True), the uploaded file is profiled chunk by chunk with tab_df.streaming.StreamingDataset instead of being loaded as a dataframe.
+    With optimize=True, the columns of the uploaded file are converted to smaller data types when it is loaded and the overview table shows their memory usage before and after.
+    Outside low-memory mode, every column is then profiled in the background with tab_df.profiling.prefetch_profiles() so that the other tabs find their results ready, and a button of the Column Profiles expander profiles every column in parallel with tab_df.profiling.profile_dataset() and displays its report.
     
     --------------------
     Parameters
     --------------------
     -> file_path (str): File path to uploaded CSV file (optional)
     -> df (pd.DataFrame): Loaded dataframe (optional)
+    -> streaming (bool): Whether to profile the uploaded file chunk by chunk (default set to False)
+    -> optimize (bool): Whether to convert the columns of the uploaded file to smaller data types (default set to False)
 
     --------------------
     Returns
@@ -27,7 +60,7 @@ def display_tab_df_content(file_path=None, df=None):
 
     """
     if file_path is not None:
-        dataset = Dataset(file_path)
+        dataset = load_dataset(file_path, streaming=streaming, optimize=optimize)
     elif df is not None:
         dataset = Dataset(df=df)
     else:
@@ -35,7 +68,12 @@ def display_tab_df_content(file_path=None, df=None):
         return
 
     st.session_state["dataset"] = dataset
+    if not streaming:
+        dataset.exact_memory = st.checkbox("Measure the exact memory usage of text columns (slower on large files)")
     dataset.set_data()
+    if not streaming:
+        # Profile the columns in the background while the overview is displayed
+        prefetch_profiles(dataset.df)
 
     with st.expander("Dataset Overview", expanded=True):
         summary = dataset.get_summary()
@@ -43,6 +81,9 @@ def display_tab_df_content(file_path=None, df=None):
             st.table(summary)
         if dataset.table is not None:
             st.write(dataset.table)
+        if dataset.duplicates is not None and not dataset.duplicates.empty:
+            st.write("Most Duplicated Rows")
+            st.dataframe(dataset.duplicates)
 
     with st.expander("View Data", expanded=True):
         n_rows = st.slider("Select number of rows to display", min_value=1, max_value=100, value=5)
@@ -53,4 +94,14 @@ def display_tab_df_content(file_path=None, df=None):
         elif method == "Tail":
             st.dataframe(dataset.get_tail(n=n_rows))
         elif method == "Sample":
-            st.dataframe(dataset.get_sample(n=n_rows))
\ No newline at end of file
+            st.dataframe(dataset.get_sample(n=n_rows))
+
+    if not streaming:
+        with st.expander("Column Profiles", expanded=False):
+            # The report is kept for the current file so that it survives the reruns triggered by the other widgets
+            report_key = f"column_profiles_{dataset.df.attrs.get('fingerprint')}"
+            if st.button("Profile every column"):
+                with st.spinner("Profiling every column..."):
+                    st.session_state[report_key] = profile_dataset(dataset.df)
+            if report_key in st.session_state:
+                st.dataframe(st.session_state[report_key])
@@ -0,0 +1,466 @@
+import numpy as np
+import pandas as pd
+
+# Number of most duplicated rows reported
+TOP_DUPLICATES = 10
+
+
+def mix_hashes(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> mix_hashes (function): Function that spreads 64-bit values over the whole 64-bit space with the finalizer of splitmix64, as pd.util.hash_pandas_object() does.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Values as uint64
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Mixed values as uint64
+    """
+    values = values ^ (values >> np.uint64(30))
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+def get_column_keys(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_column_keys (function): Function that maps every value of a column to a 64-bit key, equal keys meaning equal values for df.duplicated().
+    Numbers and dates are keyed by their bits, after turning -0.0 into 0.0 and every NaN into the same NaN for floats.
+    Other columns (text, category, Arrow-backed strings) are keyed by their pd.factorize() codes, which avoids hashing every string.
+    The codes only hold for the serie they come from, so the keys of two dataframes cannot be compared.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Column to be keyed
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Key of each value as uint64
+    """
+    dtype = serie.dtype
+    if dtype.kind == "f":
+        values = serie.to_numpy() + 0.0
+        values[np.isnan(values)] = np.nan
+        return values.astype("float64", copy=False).view("u8")
+    if dtype.kind in "iub":
+        return serie.to_numpy().astype("u8")
+    if dtype.kind in "mM" and isinstance(dtype, np.dtype):
+        return serie.to_numpy().view("i8").astype("u8")
+    return pd.factorize(serie)[0].astype("u8")
+
+
+def get_chunk_keys(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_chunk_keys (function): Function that maps every value of a column of a CSV chunk to a 64-bit key that does not depend on the data type the chunk was read with,
+    so that the keys of different chunks can be compared. Read_csv infers the data type of each chunk separately, so the same value can be an integer in one chunk,
+    a float in another one (next to a missing value) and a string in a third one (next to a text value).
+    Numbers, and strings that read as numbers, are keyed by the bits of their float64 value as in get_column_keys. Other values are keyed by the hash of their text,
+    booleans included, as a boolean column is read as the text 'True' and 'False' once a chunk holds other text.
+    Equal values always get equal keys, but a few different values can share one (for instance 1 and "1.0", or integers above 2**53), so keys only select candidates.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Column of a chunk to be keyed
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Key of each value as uint64
+    """
+    if serie.dtype.kind in "iuf":
+        return get_column_keys(serie.astype("float64"))
+    if serie.dtype.kind == "b":
+        serie = serie.astype(str)
+    numbers = pd.to_numeric(serie, errors="coerce").astype("float64")
+    booleans = numbers.isin([0.0, 1.0]).to_numpy()
+    if booleans.any():
+        # Booleans of a column with missing values are read as Python objects, which to_numeric turns into 0.0 and 1.0
+        booleans[booleans] = [type(value) is bool for value in serie.to_numpy()[booleans]]
+        numbers[booleans] = np.nan
+    keys = get_column_keys(numbers)
+    text = (numbers.isna() & serie.notna()).to_numpy()
+    if text.any():
+        keys[text] = pd.util.hash_pandas_object(serie[text].astype(str), index=False).to_numpy()
+    return keys
+
+
+def hash_rows(df, get_keys=get_column_keys):
+    """
+    --------------------
+    Description
+    --------------------
+    -> hash_rows (function): Function that hashes every row of a dataframe to a 64-bit value, vectorized across rows and combined column by column
+    so that only one column is converted at a time (see get_column_keys).
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be hashed
+    -> get_keys (function): Function mapping every value of a column to a 64-bit key (default set to get_column_keys)
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Hash of each row as uint64
+    """
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for position in range(df.shape[1]):
+        hashes *= np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= mix_hashes(get_keys(df.iloc[:, position]) + np.uint64(position))
+    return mix_hashes(hashes)
+
+
+def hash_chunk(chunk):
+    """
+    --------------------
+    Description
+    --------------------
+    -> hash_chunk (function): Function that hashes every row of a chunk of a CSV file with hash_rows and the keys of get_chunk_keys,
+    so that the hashes of rows from different chunks can be compared whatever the data types inferred for each chunk.
+
+    --------------------
+    Parameters
+    --------------------
+    -> chunk (pd.DataFrame): Chunk to be hashed
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Hash of each row as uint64
+    """
+    return hash_rows(chunk, get_keys=get_chunk_keys)
+
+
+def find_candidates(hashes):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_candidates (function): Function that finds the rows whose hash is shared with at least another row.
+    Only these rows can be duplicates, so they are the only ones that have to be compared exactly.
+
+    --------------------
+    Parameters
+    --------------------
+    -> hashes (np.ndarray): Hash of each row, as returned by hash_rows
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Boolean mask of the candidate rows
+    """
+    return pd.Series(hashes).duplicated(keep=False).to_numpy()
+
+
+def isin_sorted(values, sorted_values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> isin_sorted (function): Function that checks which values are in a sorted array with a binary search, without sorting the values as np.isin() does.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Values to be looked up
+    -> sorted_values (np.ndarray): Sorted array of unique values
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Boolean mask of the values found in sorted_values
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+def add_run(runs, run):
+    """
+    --------------------
+    Description
+    --------------------
+    -> add_run (function): Function that appends a sorted run of new hashes to a list of runs and merges the last runs while the previous one is not more than twice as long,
+    so that a list holding n hashes has about log2(n) runs.
+
+    --------------------
+    Parameters
+    --------------------
+    -> runs (list): Sorted runs of hashes, updated in place
+    -> run (np.ndarray): Sorted hashes that are in none of the runs
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+    """
+    if len(run) == 0:
+        return
+    runs.append(run)
+    while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+        last = runs.pop()
+        runs[-1] = np.sort(np.concatenate([runs[-1], last]))
+
+
+class HashCounter:
+    """
+    --------------------
+    Description
+    --------------------
+    -> HashCounter (class): Class that finds the row hashes (see hash_chunk) seen more than once in a file read chunk by chunk, without keeping the hash of every row.
+    Every distinct hash is kept once, in sorted runs merged as they grow so that each chunk is looked up in a few binary searches,
+    and the hashes found again are kept apart in the same way. Memory grows with the number of distinct rows, not with the number of rows.
+
+    --------------------
+    Attributes
+    --------------------
+    -> seen (list): Sorted runs of the distinct hashes seen so far, no hash being in two runs (default set to empty list)
+    -> repeated (list): Sorted runs of the hashes seen more than once, no hash being in two runs (default set to empty list)
+
+    """
+    def __init__(self):
+        self.seen = []
+        self.repeated = []
+
+    def update(self, hashes):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds the row hashes of a chunk.
+
+        --------------------
+        Parameters
+        --------------------
+        -> hashes (np.ndarray): Hash of each row of the chunk
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        uniques, counts = np.unique(hashes, return_counts=True)
+        known = np.zeros(len(uniques), dtype=bool)
+        for run in self.seen:
+            known |= isin_sorted(uniques, run)
+        repeated = uniques[known | (counts > 1)]
+        for run in self.repeated:
+            repeated = repeated[~isin_sorted(repeated, run)]
+        add_run(self.seen, uniques[~known])
+        add_run(self.repeated, repeated)
+
+    def get_repeated(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_repeated (method): Class method that returns the hashes seen more than once, whose rows are the only candidates to be duplicates.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (np.ndarray): Sorted hashes seen more than once, to be looked up with isin_sorted
+        """
+        if not self.repeated:
+            return np.zeros(0, dtype=np.uint64)
+        return np.sort(np.concatenate(self.repeated))
+
+
+def count_duplicates(candidates, hashes, top=TOP_DUPLICATES):
+    """
+    --------------------
+    Description
+    --------------------
+    -> count_duplicates (function): Function that checks exactly that the candidate rows sharing a hash are equal and counts the duplicated rows as df.duplicated().sum().
+    Every row is compared column by column with the first row of its hash group through the keys of get_column_keys, which are equal only for equal values.
+    If a group holds different rows (a hash collision), the candidates are compared with df.duplicated() and grouped by value instead.
+    As every duplicated row is a candidate, the result is the same as on the whole dataframe.
+
+    --------------------
+    Parameters
+    --------------------
+    -> candidates (pd.DataFrame): Candidate rows, selected with find_candidates
+    -> hashes (np.ndarray): Hash of each candidate row
+    -> top (int): Number of most duplicated rows to be reported
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Number of duplicated rows, and dataframe of the most duplicated rows with their values and their number of Occurrences
+    """
+    if candidates.empty:
+        return 0, pd.DataFrame(columns=list(candidates.columns) + ["Occurrences"])
+
+    # Hash groups are numbered in order of first appearance, so the first row of each group is where the running maximum of the group numbers increases
+    groups, uniques = pd.factorize(hashes)
+    running_max = np.maximum.accumulate(groups)
+    first = np.flatnonzero(np.r_[True, running_max[1:] > running_max[:-1]])
+    sizes = np.bincount(groups, minlength=len(uniques))
+
+    equal = np.ones(len(groups), dtype=bool)
+    for position in range(candidates.shape[1]):
+        keys = get_column_keys(candidates.iloc[:, position])
+        equal &= keys == keys[first][groups]
+
+    if not equal.all():
+        n_duplicates = int(candidates.duplicated().sum())
+        occurrences = candidates.groupby(list(candidates.columns), dropna=False, observed=True, sort=False).size()
+        occurrences = occurrences[occurrences > 1].sort_values(ascending=False, kind="stable").head(top)
+        return n_duplicates, occurrences.rename("Occurrences").reset_index()
+
+    n_duplicates = len(candidates) - len(first)
+    ranked = np.argsort(-sizes, kind="stable")
+    ranked = ranked[sizes[ranked] > 1][:top]
+    duplicates = candidates.iloc[first[ranked]].reset_index(drop=True)
+    duplicates["Occurrences"] = sizes[ranked]
+    return n_duplicates, duplicates
+
+
+def find_duplicates(df, top=TOP_DUPLICATES):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_duplicates (function): Function that counts the duplicated rows of a dataframe as df.duplicated().sum() and reports the most duplicated rows.
+    Rows are hashed with hash_rows and only the rows sharing a hash are compared exactly with count_duplicates,
+    instead of factorizing every column of the whole dataframe together.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be checked
+    -> top (int): Number of most duplicated rows to be reported
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Number of duplicated rows, and dataframe of the most duplicated rows with their values and their number of Occurrences
+    """
+    hashes = hash_rows(df)
+    mask = find_candidates(hashes)
+    return count_duplicates(df[mask], hashes[mask], top)
+
+
+class DuplicateAccumulator:
+    """
+    --------------------
+    Description
+    --------------------
+    -> DuplicateAccumulator (class): Class that counts the duplicated rows of a file chunk by chunk from the candidate rows of each chunk (see find_candidates) and their hashes (see hash_chunk),
+    without keeping every candidate row. The first row of each hash group is kept, and every later row of the group is compared with it column by column,
+    missing values being equal to each other as in df.duplicated(). Groups holding a row different from their first one (a hash collision, or values that only share a key in get_chunk_keys)
+    are recorded in collisions: their rows are then counted exactly with count_duplicates (see get_duplicates).
+    The chunks have to be read with the same data types, so that equal values compare equal.
+
+    --------------------
+    Attributes
+    --------------------
+    -> representatives (pd.DataFrame): First row of each hash group, indexed by hash in order of first appearance (default set to None)
+    -> sizes (np.ndarray): Number of rows of each hash group equal to its first row
+    -> collisions (set): Hashes of the groups holding different rows (default set to empty set)
+
+    """
+    def __init__(self):
+        self.representatives = None
+        self.sizes = np.zeros(0, dtype=np.int64)
+        self.collisions = set()
+
+    def update(self, rows, hashes):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds the candidate rows of a chunk: rows of new hash groups become their first row, and every row is compared with the first row of its group.
+
+        --------------------
+        Parameters
+        --------------------
+        -> rows (pd.DataFrame): Candidate rows of the chunk
+        -> hashes (np.ndarray): Hash of each candidate row
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if rows.empty:
+            return
+        known = self.representatives.index if self.representatives is not None else pd.Index([], dtype="uint64")
+        new = ~pd.Index(hashes).isin(known) & ~pd.Series(hashes).duplicated().to_numpy()
+        if new.any():
+            added = rows[new].set_axis(pd.Index(hashes[new]), axis=0)
+            self.representatives = added if self.representatives is None else pd.concat([self.representatives, added])
+            self.sizes = np.concatenate([self.sizes, np.zeros(int(new.sum()), dtype=np.int64)])
+
+        groups = self.representatives.index.get_indexer(hashes)
+        equal = np.ones(len(rows), dtype=bool)
+        for position in range(rows.shape[1]):
+            values = rows.iloc[:, position].to_numpy()
+            firsts = self.representatives.iloc[:, position].to_numpy()[groups]
+            equal &= (values == firsts) | (pd.isna(values) & pd.isna(firsts))
+        self.sizes += np.bincount(groups[equal], minlength=len(self.sizes))
+        self.collisions.update(hashes[~equal].tolist())
+
+    def get_duplicates(self, colliding_rows=None, colliding_hashes=None, top=TOP_DUPLICATES):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_duplicates (method): Class method that returns the number of duplicated rows, as df.duplicated().sum() on the whole file, and the most duplicated rows.
+        The groups recorded in collisions are left out and counted with count_duplicates on their rows, which have to be given if there are any.
+
+        --------------------
+        Parameters
+        --------------------
+        -> colliding_rows (pd.DataFrame): Every row whose hash is in collisions (default set to None)
+        -> colliding_hashes (np.ndarray): Hash of each colliding row (default set to None)
+        -> top (int): Number of most duplicated rows to be reported
+
+        --------------------
+        Returns
+        --------------------
+        -> (tuple): Number of duplicated rows, and dataframe of the most duplicated rows with their values and their number of Occurrences
+        """
+        if self.representatives is None:
+            return 0, pd.DataFrame(columns=["Occurrences"])
+
+        kept = ~self.representatives.index.isin(list(self.collisions))
+        representatives = self.representatives[kept]
+        sizes = self.sizes[kept]
+        n_duplicates = int(np.maximum(sizes - 1, 0).sum())
+        ranked = np.argsort(-sizes, kind="stable")
+        ranked = ranked[sizes[ranked] > 1][:top]
+        duplicates = representatives.iloc[ranked].reset_index(drop=True)
+        duplicates["Occurrences"] = sizes[ranked]
+
+        if colliding_rows is not None and not colliding_rows.empty:
+            n_colliding, colliding = count_duplicates(colliding_rows, colliding_hashes, top)
+            n_duplicates += n_colliding
+            duplicates = pd.concat([duplicates, colliding], ignore_index=True)
+            duplicates = duplicates.sort_values("Occurrences", ascending=False, kind="stable").head(top).reset_index(drop=True)
+        return n_duplicates, duplicates
@@ -1,4 +1,11 @@
 import pandas as pd
+import streamlit as st
+
+from tab_df.duplicates import find_duplicates
+from utils.cache import load_csv, load_optimized_csv, load_profile, profile_cache, save_profile
+from utils.dtypes import TEXT_DTYPES, get_memory_usage
+
+
 class Dataset:
     """
     --------------------
@@ -11,24 +18,32 @@ class Dataset:
     --------------------
     -> file_path (str): Path to the uploaded CSV file (mandatory)
     -> df (pd.Dataframe): Pandas dataframe (default set to None)
+    -> optimize (bool): Whether to convert the columns of the uploaded CSV file to smaller data types when loading it (see utils.dtypes.optimize_dtypes) (default set to False)
+    -> exact_memory (bool): Whether to measure the memory usage of object columns exactly rather than estimating it from a sample of rows (see utils.dtypes.get_memory_usage) (default set to False)
+    -> fingerprint (str): Content hash of the uploaded CSV file used as key of the dataset cache (default set to None)
     -> cols_list (list): List of columns names of dataset (default set to empty list)
     -> n_rows (int): Number of rows of dataset (default set to 0)
     -> n_cols (int): Number of columns of dataset (default set to 0)
     -> n_duplicates (int): Number of duplicated rows of dataset (default set to 0)
+    -> duplicates (pd.DataFrame): Most duplicated rows of dataset with their number of occurrences (default set to None)
     -> n_missing (int): Number of missing values of dataset (default set to 0)
     -> n_num_cols (int): Number of columns that are numeric type (default set to 0)
     -> n_text_cols (int): Number of columns that are text type (default set to 0)
-    -> table (pd.DataFrame): Pandas DataFrame containing the list of columns, their data types and memory usage from dataframe (default set to None)
+    -> table (pd.DataFrame): Pandas DataFrame containing the list of columns, their data types and memory usage from dataframe, and their original data types and memory usage if they have been optimized (default set to None)
     """
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, optimize=False, exact_memory=False):
         self.file_path = file_path
         self.df = df
+        self.optimize = optimize
+        self.exact_memory = exact_memory
+        self.fingerprint = None
         if self.file_path is not None:
             self.set_df()
         self.cols_list = []
         self.n_rows = 0
         self.n_cols = 0
         self.n_duplicates = 0
+        self.duplicates = None
         self.n_missing = 0
         self.n_num_cols = 0
         self.n_text_cols = 0
@@ -37,17 +52,29 @@ class Dataset:
     def set_data(self):
         if not self.is_df_none():
             self.set_columns()
+            # Reuse the overview already computed for this file, so that reruns only redo the work of the widgets that changed
+            if load_profile(self, self.get_profile_name()):
+                return
             self.set_dimensions()
             self.set_duplicates()
             self.set_missing()
             self.set_numeric()
             self.set_text()
             self.set_table()
+            save_profile(self, self.get_profile_name())
+
+    def get_profile_name(self):
+        # The overview depends on the data types of the columns and on how their memory usage is measured
+        return ('overview', 'optimization' in self.df.attrs, self.exact_memory)
 
     def set_df(self):
         if self.df is None and self.file_path is not None:
+            # Reuse the dataframe already parsed for a file with the same content
             try:
-                self.df = pd.read_csv(self.file_path, on_bad_lines='skip')
+                if self.optimize:
+                    self.fingerprint, self.df = load_optimized_csv(self.file_path)
+                else:
+                    self.fingerprint, self.df = load_csv(self.file_path)
             except pd.errors.ParserError:
                 st.error("There was an error reading the CSV file. Please check the file format.")
                 self.df = None
@@ -65,7 +92,8 @@ class Dataset:
 
     def set_duplicates(self):
         if not self.is_df_none():
-            self.n_duplicates = self.df.duplicated().sum()
+            # Rows are hashed and only the rows sharing a hash are compared, see tab_df.duplicates
+            self.n_duplicates, self.duplicates = find_duplicates(self.df)
 
     def set_missing(self):
         if not self.is_df_none():
@@ -77,7 +105,7 @@ class Dataset:
 
     def set_text(self):
         if not self.is_df_none():
-            self.n_text_cols = len(self.df.select_dtypes(include=['object']).columns)
+            self.n_text_cols = len(self.df.select_dtypes(include=TEXT_DTYPES).columns)
 
     def get_head(self, n=5):
         if not self.is_df_none():
@@ -91,17 +119,30 @@ class Dataset:
         if not self.is_df_none():
             return self.df.sample(n)
 
+    def get_memory_usage(self):
+        # Memory usage only depends on the content and the data types of the file, so it is kept in profile_cache with the other profiles of the dataset
+        fingerprint = self.df.attrs.get('fingerprint')
+        key = (fingerprint, 'Dataset.memory_usage', 'optimization' in self.df.attrs, self.exact_memory)
+        memory_usage = profile_cache.get(key) if fingerprint is not None else None
+        if memory_usage is None:
+            memory_usage = get_memory_usage(self.df, exact=self.exact_memory)
+            if fingerprint is not None:
+                profile_cache.put(key, memory_usage)
+        return memory_usage
+
     def set_table(self):
         if not self.is_df_none():
-            memory_usage = self.df.memory_usage(deep=True).values
-            if len(memory_usage) == len(self.df.columns) + 1:
-                memory_usage = memory_usage[1:]
+            memory_usage = self.get_memory_usage().values
             if len(memory_usage) == len(self.df.columns):
                 self.table = pd.DataFrame({
                     'Column': self.df.columns,
                     'Data Type': self.df.dtypes.astype(str),
                     'Memory Usage': memory_usage
                 })
+                # Show the data types and memory usage before utils.dtypes.optimize_dtypes converted the columns
+                optimization = self.df.attrs.get('optimization')
+                if optimization is not None:
+                    self.table = self.table.join(optimization, on='Column')
             else:
                 st.warning("Memory usage calculation failed due to inconsistent lengths. Please check your dataframe.")
 
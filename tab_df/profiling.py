@@ -0,0 +1,438 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+import pandas as pd
+
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from tab_date.logics import DateColumn
+from utils.cache import PROFILE_SKIPPED_ATTRIBUTES, make_profile_key, profile_cache
+from utils.dtypes import optimize_dtypes
+from utils.storage import get_store_path, read_store
+
+# Analyzers run on each column, keyed by the type name used in the keys of utils.cache.profile_cache
+ANALYZERS = {
+    "NumericColumn": NumericColumn,
+    "TextColumn": TextColumn,
+    "DateColumn": DateColumn,
+}
+
+# Process pool shared by every rerun and session, created on first use, and its number of worker processes
+process_pool = None
+process_pool_workers = None
+process_pool_lock = threading.Lock()
+
+# Fingerprints and optimization flags of the datasets already profiled or being profiled in the background by prefetch_profiles, so that reruns do not submit them again
+prefetched = set()
+prefetching_lock = threading.Lock()
+
+# Futures of the profiles being computed in the background by run_prefetch, keyed as profile_cache, so that profile_dataset waits for them instead of submitting them again
+pending_profiles = {}
+
+
+def get_process_pool(max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_process_pool (function): Function that returns the process pool used to profile columns, creating it on first use
+    and again when it has been discarded (see discard_process_pool) or when another number of worker processes is requested.
+    The replaced pool finishes its pending tasks in the background. Workers are started with the spawn method so that they do not inherit the threads of the Streamlit server.
+
+    --------------------
+    Parameters
+    --------------------
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> (ProcessPoolExecutor): Process pool
+    """
+    global process_pool, process_pool_workers
+    max_workers = max_workers or os.cpu_count()
+    with process_pool_lock:
+        if process_pool is not None and process_pool_workers != max_workers:
+            process_pool.shutdown(wait=False)
+            process_pool = None
+        if process_pool is None:
+            process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn"))
+            process_pool_workers = max_workers
+        return process_pool
+
+
+def discard_process_pool(pool):
+    """
+    --------------------
+    Description
+    --------------------
+    -> discard_process_pool (function): Function that drops a process pool that cannot run tasks any more (BrokenProcessPool, raised when a worker process dies),
+    so that the next call to get_process_pool creates a new one.
+
+    --------------------
+    Parameters
+    --------------------
+    -> pool (ProcessPoolExecutor): Broken process pool
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+    """
+    global process_pool
+    with process_pool_lock:
+        if process_pool is pool:
+            process_pool = None
+    pool.shutdown(wait=False)
+
+
+def profile_column(analyzer_name, col_name, fingerprint=None, serie=None, optimize=False):
+    """
+    --------------------
+    Description
+    --------------------
+    -> profile_column (function): Function run in a worker process that profiles one column with NumericColumn, TextColumn or DateColumn.
+    The column is memory-mapped from the Arrow file of the dataset (see utils.storage.read_store), so that it is shared with the main process through the page cache
+    instead of being pickled. A serie is only sent when the dataset has no Arrow file.
+    As the Arrow file holds the parsed data types, the column is optimized in the worker when the profiled dataframe is (see utils.dtypes.optimize_dtypes).
+    If the Arrow file has been removed since the task was submitted (see utils.storage.evict_files), a FileNotFoundError is raised so that the column is sent again (see get_profile_result).
+
+    --------------------
+    Parameters
+    --------------------
+    -> analyzer_name (str): Name of the analyzer class, a key of ANALYZERS
+    -> col_name (str): Name of the column to be profiled
+    -> fingerprint (str): Content hash of the dataset, used to find its Arrow file (default set to None)
+    -> serie (pd.Series): Column to be profiled if the dataset has no Arrow file (default set to None)
+    -> optimize (bool): True to optimize the data type of the column read from the Arrow file (default set to False)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Attributes computed by the analyzer set_data() method, as stored in profile_cache, and time spent in seconds
+    """
+    start = time.perf_counter()
+    df = read_store(fingerprint, columns=[col_name]) if serie is None else serie.to_frame()
+    if df is None:
+        raise FileNotFoundError(f"The Arrow file of the dataset {fingerprint} is missing")
+    if optimize and serie is None:
+        df = optimize_dtypes(df)
+    if fingerprint is not None:
+        df.attrs["fingerprint"] = fingerprint
+    analyzer = ANALYZERS[analyzer_name](df=df)
+    analyzer.set_data(col_name)
+    profile = {
+        name: value for name, value in analyzer.__dict__.items()
+        if name not in PROFILE_SKIPPED_ATTRIBUTES
+    }
+    return profile, time.perf_counter() - start
+
+
+def get_profile_tasks(df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_profile_tasks (function): Function that lists the columns of a dataframe that each analyzer would offer in its select box,
+    using the same column detection as NumericColumn.find_num_cols, TextColumn.find_text_cols and DateColumn.find_date_cols.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be profiled
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Pairs of analyzer name and column name
+    """
+    num_col = NumericColumn(df=df)
+    num_col.find_num_cols()
+    text_col = TextColumn(df=df)
+    text_col.find_text_cols()
+    date_col = DateColumn(df=df)
+    date_col.find_date_cols()
+    return (
+        [("NumericColumn", col_name) for col_name in num_col.cols_list]
+        + [("TextColumn", col_name) for col_name in text_col.cols_list]
+        + [("DateColumn", col_name) for col_name in date_col.cols_list]
+    )
+
+
+def submit_profile(pool, df, analyzer_name, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> submit_profile (function): Function that submits the profiling of a column to a process pool, passing the column itself only if the dataset has no Arrow file to be memory-mapped.
+
+    --------------------
+    Parameters
+    --------------------
+    -> pool (ProcessPoolExecutor): Process pool
+    -> df (pd.DataFrame): Dataframe holding the column
+    -> analyzer_name (str): Name of the analyzer class, a key of ANALYZERS
+    -> col_name (str): Name of the column to be profiled
+
+    --------------------
+    Returns
+    --------------------
+    -> (concurrent.futures.Future): Future of profile_column
+    """
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is not None and os.path.exists(get_store_path(fingerprint)):
+        return pool.submit(profile_column, analyzer_name, col_name, fingerprint, None, "optimization" in df.attrs)
+    return pool.submit(profile_column, analyzer_name, col_name, fingerprint, df[col_name])
+
+
+def submit_profiles(df, tasks, max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> submit_profiles (function): Function that submits the profiling of several columns to the process pool with submit_profile.
+    If the pool is broken, it is replaced once and the columns are submitted again.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe holding the columns
+    -> tasks (list): Pairs of analyzer name and column name
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Process pool, and dictionary mapping each future of profile_column to its pair of analyzer name and column name
+    """
+    pool = get_process_pool(max_workers)
+    try:
+        return pool, {submit_profile(pool, df, analyzer_name, col_name): (analyzer_name, col_name) for analyzer_name, col_name in tasks}
+    except BrokenProcessPool:
+        discard_process_pool(pool)
+        pool = get_process_pool(max_workers)
+        return pool, {submit_profile(pool, df, analyzer_name, col_name): (analyzer_name, col_name) for analyzer_name, col_name in tasks}
+
+
+def get_profile_result(future, df, analyzer_name, col_name, max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_profile_result (function): Function that returns the result of a future of profile_column.
+    If the worker did not find the Arrow file of the dataset, the column is submitted again with its serie and its result is awaited.
+
+    --------------------
+    Parameters
+    --------------------
+    -> future (concurrent.futures.Future): Future of profile_column
+    -> df (pd.DataFrame): Dataframe holding the column
+    -> analyzer_name (str): Name of the analyzer class, a key of ANALYZERS
+    -> col_name (str): Name of the profiled column
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Result of profile_column
+    """
+    try:
+        return future.result()
+    except FileNotFoundError:
+        pool = get_process_pool(max_workers)
+        return pool.submit(profile_column, analyzer_name, col_name, df.attrs.get("fingerprint"), df[col_name]).result()
+
+
+def profile_dataset(df, max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> profile_dataset (function): Function that profiles every numeric, text and date column of a dataframe in parallel, one task per column in a process pool.
+    The computed profiles are stored in profile_cache, so that selecting any column in the Numeric, Text or Datetime tab is then instant,
+    and a report with the main results of every column is returned. A column whose profiling fails is reported with its error instead of stopping the others,
+    and a pool broken by the failure is replaced for the next calls.
+    Columns already in profile_cache are reported from it, and columns being profiled in the background by prefetch_profiles are waited for, so no column is profiled twice.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be profiled
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Report with one row per profiled column and the columns Column, Analyzer, Unique Values, Missing Values, Time (s) and Error
+    """
+    rows = []
+    tasks = []
+    prefetching_futures = {}
+    for analyzer_name, col_name in get_profile_tasks(df):
+        key = make_profile_key(df, col_name, analyzer_name)
+        profile = profile_cache.get(key) if key is not None else None
+        if profile is not None:
+            rows.append({
+                "Column": col_name,
+                "Analyzer": analyzer_name,
+                "Unique Values": profile.get("n_unique"),
+                "Missing Values": profile.get("n_missing"),
+                "Error": None,
+            })
+            continue
+        with prefetching_lock:
+            future = pending_profiles.get(key)
+        if future is not None:
+            prefetching_futures[future] = (analyzer_name, col_name)
+        else:
+            tasks.append((analyzer_name, col_name))
+
+    pool, futures = submit_profiles(df, tasks, max_workers)
+    futures.update(prefetching_futures)
+    for future in as_completed(futures):
+        analyzer_name, col_name = futures[future]
+        try:
+            profile, seconds = get_profile_result(future, df, analyzer_name, col_name, max_workers)
+        except Exception as error:
+            # A pool broken under a background future is replaced by run_prefetch
+            if isinstance(error, BrokenProcessPool) and future not in prefetching_futures:
+                discard_process_pool(pool)
+            rows.append({
+                "Column": col_name,
+                "Analyzer": analyzer_name,
+                "Error": f"{type(error).__name__}: {error}",
+            })
+            continue
+        key = make_profile_key(df, col_name, analyzer_name)
+        if key is not None:
+            profile_cache.put(key, profile)
+        rows.append({
+            "Column": col_name,
+            "Analyzer": analyzer_name,
+            "Unique Values": profile.get("n_unique"),
+            "Missing Values": profile.get("n_missing"),
+            "Time (s)": round(seconds, 3),
+            "Error": None,
+        })
+
+    # Keep the order of the columns in the file
+    order = {col_name: position for position, col_name in enumerate(df.columns)}
+    rows.sort(key=lambda row: (order.get(row["Column"], len(order)), row["Analyzer"]))
+    return pd.DataFrame(rows, columns=["Column", "Analyzer", "Unique Values", "Missing Values", "Time (s)", "Error"])
+
+
+def get_prefetch_order(tasks):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_prefetch_order (function): Function that sorts profiling tasks so that the column selected by default in each tab, the first one of its select box, is profiled first.
+    The other columns keep the order of get_profile_tasks.
+
+    --------------------
+    Parameters
+    --------------------
+    -> tasks (list): Pairs of analyzer name and column name returned by get_profile_tasks
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Sorted pairs of analyzer name and column name
+    """
+    defaults = []
+    others = []
+    seen = set()
+    for analyzer_name, col_name in tasks:
+        if analyzer_name in seen:
+            others.append((analyzer_name, col_name))
+        else:
+            seen.add(analyzer_name)
+            defaults.append((analyzer_name, col_name))
+    return defaults + others
+
+
+def run_prefetch(df, prefetch_key, max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> run_prefetch (function): Function run in a background thread by prefetch_profiles that submits every column not yet in profile_cache to the process pool,
+    in the order of get_prefetch_order as the pool runs tasks in submission order, and stores each profile in profile_cache as soon as it is computed.
+    The futures are kept in pending_profiles until then. A column whose profiling fails is skipped, its tab will then compute it when it is selected.
+    If listing or submitting the columns fails, the dataset is removed from prefetched so that the next rerun tries again.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be profiled
+    -> prefetch_key (tuple): Content hash of the dataframe and optimization flag, as kept in prefetched
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+    """
+    try:
+        tasks = [
+            (analyzer_name, col_name) for analyzer_name, col_name in get_prefetch_order(get_profile_tasks(df))
+            if make_profile_key(df, col_name, analyzer_name) not in profile_cache
+        ]
+        pool, futures = submit_profiles(df, tasks, max_workers)
+    except Exception:
+        with prefetching_lock:
+            prefetched.discard(prefetch_key)
+        raise
+
+    with prefetching_lock:
+        for future, (analyzer_name, col_name) in futures.items():
+            pending_profiles[make_profile_key(df, col_name, analyzer_name)] = future
+    for future in as_completed(futures):
+        analyzer_name, col_name = futures[future]
+        key = make_profile_key(df, col_name, analyzer_name)
+        try:
+            profile_cache.put(key, get_profile_result(future, df, analyzer_name, col_name, max_workers)[0])
+        except BrokenProcessPool:
+            discard_process_pool(pool)
+        except Exception:
+            pass
+        with prefetching_lock:
+            pending_profiles.pop(key, None)
+
+
+def prefetch_profiles(df, max_workers=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> prefetch_profiles (function): Function that starts profiling every column of a dataframe in the background, so that selecting a column in the Numeric, Text or Datetime tab
+    usually finds its profile already in profile_cache. It returns immediately: the columns are listed and submitted to the process pool by a daemon thread (see run_prefetch).
+    Nothing is started for a dataframe without fingerprint, whose profiles cannot be cached, or already prefetched once, so that reruns do not submit again
+    the profiles that profile_cache has evicted since (their tab computes them again when they are selected).
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be profiled
+    -> max_workers (int): Number of worker processes (default set to None for the number of CPUs)
+
+    --------------------
+    Returns
+    --------------------
+    -> (threading.Thread): Background thread, or None if nothing has been started
+    """
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is None:
+        return None
+    prefetch_key = (fingerprint, "optimization" in df.attrs)
+    with prefetching_lock:
+        if prefetch_key in prefetched:
+            return None
+        prefetched.add(prefetch_key)
+    thread = threading.Thread(target=run_prefetch, args=(df, prefetch_key, max_workers), daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,368 @@
+import numpy as np
+import pandas as pd
+
+from tab_df.logics import Dataset
+from tab_num.stats import NumericAccumulator
+from tab_text.stats import TextAccumulator
+from tab_date.stats import DateAccumulator
+from tab_date.parsing import detect_dates
+from tab_df.duplicates import DuplicateAccumulator, HashCounter, hash_chunk, isin_sorted
+from utils.cache import dataset_cache, get_fingerprint
+
+# Number of rows read from the CSV file at once
+CHUNK_SIZE = 100000
+
+# Number of rows kept to display the head, tail and a random sample of the file
+PREVIEW_ROWS = 100
+
+
+class StreamingDataset(Dataset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> StreamingDataset (class): Class that profiles an uploaded CSV file chunk by chunk instead of loading it as a single dataframe.
+    Every chunk is folded into mergeable accumulators (tab_num.stats.NumericAccumulator, tab_text.stats.TextAccumulator and tab_date.stats.DateAccumulator),
+    so that peak memory depends on the chunk size and on the number of distinct values rather than on the file size.
+    It exposes the same overview as tab_df.logics.Dataset and fills NumericColumn, TextColumn and DateColumn analyzers with the same summaries.
+    Column types are inferred from the first chunk.
+
+    --------------------
+    Attributes
+    --------------------
+    -> chunksize (int): Number of rows read at once (default set to CHUNK_SIZE)
+    -> num_cols_list (list): List of columns names that are numeric type (default set to empty list)
+    -> text_cols_list (list): List of columns names that are text type (default set to empty list)
+    -> date_cols_list (list): List of columns names that can be converted to datetime (default set to empty list)
+    -> accumulators (dict): Accumulators of each column, keyed by analyzer type and then by column name
+    -> memory_usage (pd.Series): Memory that each column would use if the file was loaded in memory (default set to None)
+    -> head (pd.DataFrame): First PREVIEW_ROWS rows of the file (default set to None)
+    -> tail (pd.DataFrame): Last PREVIEW_ROWS rows of the file (default set to None)
+    -> sample (pd.DataFrame): Uniform random sample of PREVIEW_ROWS rows of the file (default set to None)
+    -> sample_keys (np.ndarray): Random keys of the sampled rows, the rows with the smallest keys are kept (default set to None)
+    -> hash_counter (HashCounter): Distinct row hashes seen so far and the ones seen more than once, used to count duplicated rows
+    -> dtype_kinds (dict): Kinds of the data types inferred for each column over the chunks, used to read the file again with the same data types in every chunk (default set to empty dict)
+    -> rng (np.random.Generator): Random generator used to sample rows, seeded so that reruns show the same sample
+
+    """
+    def __init__(self, file_path=None, chunksize=CHUNK_SIZE):
+        super().__init__(file_path=file_path)
+        self.chunksize = chunksize
+        self.num_cols_list = []
+        self.text_cols_list = []
+        self.date_cols_list = []
+        self.accumulators = {"NumericColumn": {}, "TextColumn": {}, "DateColumn": {}}
+        self.memory_usage = None
+        self.head = None
+        self.tail = None
+        self.sample = None
+        self.sample_keys = None
+        self.hash_counter = HashCounter()
+        self.dtype_kinds = {}
+        self.rng = np.random.default_rng(0)
+
+    def set_df(self):
+        # The file is never loaded as a single dataframe
+        pass
+
+    def is_df_none(self):
+        return self.head is None or self.head.empty
+
+    def set_data(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_data (method): Class method that reads the CSV file chunk by chunk, folds every chunk into the accumulators and then computes the overview of the dataset.
+        It does nothing if the file has already been profiled.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.head is not None or self.file_path is None:
+            return
+        if hasattr(self.file_path, 'seek'):
+            self.file_path.seek(0)
+        for chunk in pd.read_csv(self.file_path, chunksize=self.chunksize, on_bad_lines='skip'):
+            self.update(chunk)
+        if self.head is not None:
+            self.set_duplicates()
+            self.set_table()
+
+    def update(self, chunk):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that folds a chunk of the CSV file into the overview counters, the previews and the accumulators of every column.
+
+        --------------------
+        Parameters
+        --------------------
+        -> chunk (pd.DataFrame): Chunk of the CSV file
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.head is None:
+            self.set_columns_from_chunk(chunk)
+        self.n_rows += len(chunk)
+        self.n_missing += int(chunk.isna().sum().sum())
+        self.hash_counter.update(hash_chunk(chunk))
+        for col_name, dtype in chunk.dtypes.items():
+            self.dtype_kinds.setdefault(col_name, set()).add(dtype.kind)
+        chunk_memory = chunk.memory_usage(index=False, deep=True)
+        self.memory_usage = chunk_memory if self.memory_usage is None else self.memory_usage.add(chunk_memory, fill_value=0)
+        self.set_previews(chunk)
+
+        for col_name in self.num_cols_list:
+            self.accumulators["NumericColumn"][col_name].update(chunk[col_name])
+        for col_name in self.text_cols_list:
+            self.accumulators["TextColumn"][col_name].update(chunk[col_name])
+        for col_name in self.date_cols_list:
+            self.accumulators["DateColumn"][col_name].update(chunk[col_name])
+
+    def set_columns_from_chunk(self, chunk):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_columns_from_chunk (method): Class method that finds the columns of the file and their types from its first chunk,
+        using the same rules as NumericColumn.find_num_cols, TextColumn.find_text_cols and DateColumn.find_date_cols, and creates their accumulators.
+
+        --------------------
+        Parameters
+        --------------------
+        -> chunk (pd.DataFrame): First chunk of the CSV file
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        self.cols_list = list(chunk.columns)
+        self.n_cols = len(self.cols_list)
+        self.num_cols_list = chunk.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        self.text_cols_list = chunk.select_dtypes(include='object').columns.tolist()
+        self.n_num_cols = len(chunk.select_dtypes(include=['number']).columns)
+        self.n_text_cols = len(self.text_cols_list)
+        self.accumulators["NumericColumn"] = {col_name: NumericAccumulator() for col_name in self.num_cols_list}
+        self.accumulators["TextColumn"] = {col_name: TextAccumulator() for col_name in self.text_cols_list}
+        for col_name in self.text_cols_list:
+            dates = detect_dates(chunk[col_name])
+            if dates is not None:
+                self.date_cols_list.append(col_name)
+                self.accumulators["DateColumn"][col_name] = DateAccumulator()
+                self.accumulators["DateColumn"][col_name].date_format = dates[1]["format"]
+
+    def set_previews(self, chunk):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_previews (method): Class method that keeps the first and last PREVIEW_ROWS rows of the file and a uniform random sample of PREVIEW_ROWS rows,
+        sampled by giving each row a random key and keeping the rows with the smallest keys.
+
+        --------------------
+        Parameters
+        --------------------
+        -> chunk (pd.DataFrame): Chunk of the CSV file
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.head is None:
+            self.head = chunk.head(PREVIEW_ROWS)
+            self.tail = chunk.tail(PREVIEW_ROWS)
+            self.sample = chunk.iloc[:0]
+            self.sample_keys = np.empty(0)
+        else:
+            self.tail = pd.concat([self.tail, chunk.tail(PREVIEW_ROWS)]).tail(PREVIEW_ROWS)
+
+        keys = np.concatenate([self.sample_keys, self.rng.random(len(chunk))])
+        rows = pd.concat([self.sample, chunk])
+        kept = np.argsort(keys, kind="stable")[:PREVIEW_ROWS]
+        self.sample = rows.iloc[kept]
+        self.sample_keys = keys[kept]
+
+    def set_duplicates(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_duplicates (method): Class method that counts the duplicated rows of the file and finds the most duplicated ones from the row hashes gathered by hash_counter.
+        Only the rows whose hash has been seen more than once can be duplicates: if there are any, the file is read a second time with the same data types in every chunk (see get_read_dtypes),
+        and the candidate rows of each chunk, hashed again, are compared with the first row of their hash group by tab_df.duplicates.DuplicateAccumulator.
+        Only the rows of the rare groups holding different rows are read a third time and compared together. Files without duplicates are only read once.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        repeated = self.hash_counter.get_repeated()
+        self.hash_counter = HashCounter()
+        if len(repeated) == 0:
+            self.n_duplicates = 0
+            self.duplicates = self.head.iloc[:0].assign(Occurrences=0)
+            return
+        accumulator = DuplicateAccumulator()
+        for chunk in self.read_chunks():
+            hashes = hash_chunk(chunk)
+            candidates = isin_sorted(hashes, repeated)
+            accumulator.update(chunk[candidates], hashes[candidates])
+
+        colliding_rows = None
+        colliding_hashes = None
+        if accumulator.collisions:
+            collisions = np.sort(np.fromiter(accumulator.collisions, dtype=np.uint64))
+            colliding_rows = []
+            colliding_hashes = []
+            for chunk in self.read_chunks():
+                hashes = hash_chunk(chunk)
+                colliding = isin_sorted(hashes, collisions)
+                colliding_rows.append(chunk[colliding])
+                colliding_hashes.append(hashes[colliding])
+            colliding_rows = pd.concat(colliding_rows)
+            colliding_hashes = np.concatenate(colliding_hashes)
+        self.n_duplicates, self.duplicates = accumulator.get_duplicates(colliding_rows, colliding_hashes)
+
+    def get_read_dtypes(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_read_dtypes (method): Class method that returns the data types to read the file with so that every chunk gets the data types a single read of the whole file would give:
+        text for the columns read as text in any chunk, float64 for the numeric columns read as floats in any chunk. Other columns keep the inferred data type.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Data type of each column to be forced, as expected by pd.read_csv
+        """
+        dtypes = {}
+        for col_name, kinds in self.dtype_kinds.items():
+            if not kinds <= set("iufb") or ("b" in kinds and len(kinds) > 1):
+                dtypes[col_name] = str
+            elif "f" in kinds:
+                dtypes[col_name] = "float64"
+        return dtypes
+
+    def read_chunks(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> read_chunks (method): Class method that reads the CSV file again chunk by chunk, with the data types of get_read_dtypes.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (iterator): Chunks of the CSV file
+        """
+        if hasattr(self.file_path, 'seek'):
+            self.file_path.seek(0)
+        return pd.read_csv(self.file_path, chunksize=self.chunksize, on_bad_lines='skip', dtype=self.get_read_dtypes())
+
+    def get_head(self, n=5):
+        if not self.is_df_none():
+            return self.head.head(n)
+
+    def get_tail(self, n=5):
+        if not self.is_df_none():
+            return self.tail.tail(n)
+
+    def get_sample(self, n=5):
+        if not self.is_df_none():
+            return self.sample.sample(min(n, len(self.sample)))
+
+    def set_table(self):
+        if not self.is_df_none():
+            self.table = pd.DataFrame({
+                'Column': self.head.columns,
+                'Data Type': self.head.dtypes.astype(str),
+                'Memory Usage': self.memory_usage.reindex(self.head.columns).values
+            })
+
+    def set_column(self, analyzer, col_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_column (method): Class method that fills a NumericColumn, TextColumn or DateColumn analyzer with the chunked profile of a column,
+        in place of its set_data() method.
+
+        --------------------
+        Parameters
+        --------------------
+        -> analyzer (object): Instance of NumericColumn, TextColumn or DateColumn
+        -> col_name (str): Name of the column to be displayed
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        accumulator = self.accumulators[type(analyzer).__name__].get(col_name)
+        if accumulator is not None:
+            accumulator.finalize(analyzer)
+
+
+def load_streaming_dataset(file_path, chunksize=CHUNK_SIZE):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_streaming_dataset (function): Function that returns the StreamingDataset of an uploaded CSV file, profiling it only if no file with the same content has been profiled before.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str or UploadedFile): Path to a CSV file or file-like object returned by Streamlit file_uploader
+    -> chunksize (int): Number of rows read at once
+
+    --------------------
+    Returns
+    --------------------
+    -> (StreamingDataset): Profiled dataset
+
+    """
+    key = (get_fingerprint(file_path), "streaming", chunksize)
+    dataset = dataset_cache.get(key)
+    if dataset is None:
+        dataset = StreamingDataset(file_path=file_path, chunksize=chunksize)
+        dataset.set_data()
+        dataset_cache.put(key, dataset)
+    return dataset
@@ -8,19 +8,21 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from tab_num.logics import NumericColumn
 
-def display_tab_num_content(file_path=None, df=None):
+def display_tab_num_content(file_path=None, df=None, dataset=None):
     """
     --------------------
     Description
     --------------------
     -> display_tab_num_content (function): Function that will instantiate tab_num.logics.NumericColumn class, save it into Streamlit session state, and call its methods to find all numeric columns.
     Then it displays various analyses such as histograms, box plots, and scatter plots.
+    If a tab_df.streaming.StreamingDataset is provided, the summary of its chunked profile is displayed instead and the charts are skipped.
 
     --------------------
     Parameters
     --------------------
     -> file_path (str): File path to uploaded CSV file (optional)
     -> df (pd.DataFrame): Loaded DataFrame (optional)
+    -> dataset (StreamingDataset): Dataset profiled chunk by chunk (optional)
 
     --------------------
     Returns
@@ -31,7 +33,10 @@ def display_tab_num_content(file_path=None, df=None):
     num_col_analyzer = NumericColumn(file_path=file_path, df=df)
 
     # Load and identify numeric columns
-    num_col_analyzer.find_num_cols()
+    if dataset is not None:
+        num_col_analyzer.cols_list = dataset.num_cols_list
+    else:
+        num_col_analyzer.find_num_cols()
     numeric_columns = num_col_analyzer.cols_list
 
     if not numeric_columns:
@@ -46,22 +51,34 @@ def display_tab_num_content(file_path=None, df=None):
     )
 
     # Set data for the selected column and compute stats
-    num_col_analyzer.set_data(selected_column)
+    if dataset is not None:
+        dataset.set_column(num_col_analyzer, selected_column)
+    else:
+        num_col_analyzer.set_data(selected_column)
 
     # Display statistics summary
     st.subheader(f"Statistics Summary for {selected_column}")
     summary_df = num_col_analyzer.get_summary()
     st.table(summary_df)
 
+    # Display any percentile of the column
+    percentile = st.slider("Select a percentile:", min_value=0, max_value=100, value=95, key="numeric_percentile_select")
+    st.write(f"{percentile}th percentile of {selected_column}: {num_col_analyzer.get_percentile(percentile / 100)}")
+
+    # Charts need the whole column, which is not loaded in low-memory mode
+    if dataset is not None:
+        st.subheader("Most Frequent Values")
+        st.dataframe(num_col_analyzer.frequent)
+        return
+
     # Display histogram
     st.subheader("Histogram")
     st.altair_chart(num_col_analyzer.histogram, use_container_width=True)
 
     # Display box plot
     st.subheader("Interactive Box Plot")
-    box_plot = num_col_analyzer.set_boxplot()
-    if box_plot:
-        st.altair_chart(box_plot, use_container_width=True)
+    if num_col_analyzer.boxplot:
+        st.altair_chart(num_col_analyzer.boxplot, use_container_width=True)
 
     # Display scatter plot (with user selection for second column)
     st.subheader("Interactive Scatter Plot")
@@ -69,3 +86,7 @@ def display_tab_num_content(file_path=None, df=None):
     scatter_plot = num_col_analyzer.set_scatterplot(other_column)
     if scatter_plot:
         st.altair_chart(scatter_plot, use_container_width=True)
+        if num_col_analyzer.scatter_mode == "sample":
+            st.caption("Showing a stratified random sample of the rows.")
+        elif num_col_analyzer.scatter_mode == "density":
+            st.caption("Showing the number of rows in each cell of a 2D grid.")
@@ -1,7 +1,25 @@
 # tab_numeric/logics.py
+import numpy as np
 import pandas as pd
 import altair as alt
 
+from utils.cache import load_columns, load_profile, save_profile
+from utils.dtypes import NUM_DTYPES
+from utils.sketches import EXACT_FREQUENT_DISTINCT, FrequentItems, QuantileSketch, count_distinct
+from tab_num.stats import (
+    bin_scatter,
+    compute_boxplot,
+    compute_histogram,
+    compute_numeric_stats,
+    count_infinite,
+    get_scatter_mode,
+    sample_scatter,
+    to_float_buffer,
+)
+
+# Above this number of rows, the median and percentiles are estimated with a QuantileSketch instead of a copy and partial sort of the whole column
+EXACT_QUANTILE_ROWS = 10000000
+
 #class to look after numeric data types
 class NumericColumn:
     """
@@ -15,6 +33,7 @@ class NumericColumn:
     --------------------
     -> file_path (str): Path to the uploaded CSV file (optional)
     -> df (pd.DataFrame): Pandas dataframe (optional)
+    -> approx_distinct (bool): True to count unique values with a HyperLogLog, False to count them exactly, None to only approximate long series (default set to None)
     -> cols_list (list): List of columns names of dataset that are numeric type (default set to empty list)
     -> serie (pd.Series): Pandas series where the content of a column has been loaded (default set to None)
     -> n_unique (int): Number of unique values of a series (default set to None)
@@ -24,12 +43,16 @@ class NumericColumn:
     -> col_min (int): Minimum value of a series (default set to None)
     -> col_max (int): Maximum value of a series (default set to None)
     -> col_median (int): Median value of a series (default set to None)
+    -> sketch (QuantileSketch): Quantile sketch of a series, only built for series longer than EXACT_QUANTILE_ROWS or profiled chunk by chunk (default set to None)
     -> n_zeros (int): Number of times a series has values equal to 0 (default set to None)
     -> n_negatives (int): Number of times a series has negative values (default set to None)
+    -> n_infinite (int): Number of inf and -inf values of a series, left out of the charts (default set to 0)
     -> histogram (alt.Chart): Altair histogram displaying the count for each bin value of a series (default set to empty)
+    -> boxplot (alt.Chart): Altair box plot displaying the quartiles, whiskers and outliers of a series (default set to None)
     -> frequent (pd.DataFrame): Dataframe containing the most frequent values of a series (default set to empty)
+    -> scatter_mode (str): How the last scatter plot was drawn: 'points', 'sample' or 'density' (default set to None)
     """
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, approx_distinct=None):
         """
         --------------------
         Description
@@ -41,6 +64,7 @@ class NumericColumn:
         --------------------
         -> file_path (str): Path to the CSV file to load (optional)
         -> df (pd.DataFrame): Preloaded Pandas DataFrame (optional)
+        -> approx_distinct (bool): Mode used to count unique values, see utils.sketches.count_distinct (optional)
 
         --------------------
         Returns
@@ -48,7 +72,8 @@ class NumericColumn:
         -> None
         """
         self.file_path = file_path
-        self.df = df if df is not None else pd.read_csv(file_path) if file_path else pd.DataFrame()
+        self.df = df if df is not None else load_columns(file_path, include=NUM_DTYPES)[1] if file_path else pd.DataFrame()
+        self.approx_distinct = approx_distinct
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -58,10 +83,14 @@ class NumericColumn:
         self.col_min = None
         self.col_max = None
         self.col_median = None
+        self.sketch = None
         self.n_zeros = None
         self.n_negatives = None
+        self.n_infinite = 0
         self.histogram = alt.Chart()
+        self.boxplot = None
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.scatter_mode = None
 
     #function to find numeric columns
     def find_num_cols(self):
@@ -82,7 +111,7 @@ class NumericColumn:
         -> None
         """
         if not self.df.empty:
-            self.cols_list = self.df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+            self.cols_list = self.df.select_dtypes(include=NUM_DTYPES).columns.tolist()
 
     def set_data(self, col_name):
         """
@@ -102,19 +131,23 @@ class NumericColumn:
         -> None
         """
         if col_name in self.df.columns:
+            # Reuse the statistics and charts already computed for this column
+            if load_profile(self, col_name):
+                # Profiles do not hold the column (see utils.cache.save_profile), which get_percentile and the scatter plot still need,
+                # and an analyzer reused for another column still holds the previous one
+                if self.serie is None or self.serie.name != col_name:
+                    self.serie = self.df[col_name]
+                    self.convert_serie_to_num()
+                return
             self.serie = self.df[col_name]
             self.convert_serie_to_num()
             self.set_unique()
-            self.set_missing()
-            self.set_zeros()
-            self.set_negatives()
-            self.set_mean()
-            self.set_std()
-            self.set_min()
-            self.set_max()
+            self.set_stats()
             self.set_median()
             self.set_histogram()
+            self.set_boxplot()
             self.set_frequent()
+            save_profile(self, col_name)
 
     #typecasting function
     def convert_serie_to_num(self):
@@ -157,6 +190,36 @@ class NumericColumn:
         """
         return self.serie is None or self.serie.empty
 
+    #fused statistics function
+    def set_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_stats (method): Class method that computes the number of missing, zero and negative values, the mean, standard deviation, minimum and maximum of self.serie
+        in a single pass over its values (see tab_num.stats.NumericStats). It gives the same results as calling set_missing, set_zeros, set_negatives, set_mean, set_std, set_min and set_max.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+        """
+        if not self.is_serie_none():
+            stats = compute_numeric_stats(self.serie)
+            self.n_missing = stats.n_missing
+            self.n_zeros = stats.n_zeros
+            self.n_negatives = stats.n_negatives
+            self.col_mean = round(stats.get_mean(), 2)
+            self.col_std = round(stats.get_std(), 2)
+            self.col_min = stats.col_min
+            # Integer columns keep integer extremes, as Series.min() and Series.max() do
+            self.col_max = stats.col_max
+
     #unique value function
     def set_unique(self):
         """
@@ -164,6 +227,7 @@ class NumericColumn:
         Description
         --------------------
         -> set_unique (method): Class method that calculates the number of unique values in self.serie.
+        The count is estimated with a HyperLogLog for long series or when self.approx_distinct is True (see utils.sketches.count_distinct).
 
         --------------------
         Parameters
@@ -176,7 +240,7 @@ class NumericColumn:
         -> None
         """
         if not self.is_serie_none():
-            self.n_unique = self.serie.nunique()
+            self.n_unique = count_distinct(self.serie, approximate=self.approx_distinct)
 
     #missing value function
     def set_missing(self):
@@ -332,6 +396,7 @@ class NumericColumn:
         Description
         --------------------
         -> set_median (method): Class method that calculates the median value of self.serie.
+        For series longer than EXACT_QUANTILE_ROWS, the median is estimated with a QuantileSketch (utils.sketches) that is kept in self.sketch for get_percentile().
 
         --------------------
         Parameters
@@ -344,7 +409,40 @@ class NumericColumn:
         -> None
         """
         if not self.is_serie_none():
-            self.col_median = self.serie.median()
+            if len(self.serie) > EXACT_QUANTILE_ROWS:
+                self.sketch = QuantileSketch()
+                self.sketch.update(to_float_buffer(self.serie))
+                self.col_median = self.sketch.get_median()
+            else:
+                # Series.median() fills missing values in place, which fails on the read-only columns memory-mapped by utils.storage.read_store
+                values = to_float_buffer(self.serie)
+                values = values[~np.isnan(values)]
+                self.col_median = float(np.median(values)) if len(values) else np.nan
+
+    #percentile function
+    def get_percentile(self, q):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_percentile (method): Class method that returns the value below which a fraction q of self.serie falls.
+        It is estimated from self.sketch when it has been built, and computed exactly from self.serie otherwise.
+
+        --------------------
+        Parameters
+        --------------------
+        -> q (float): Fraction between 0 and 1
+
+        --------------------
+        Returns
+        --------------------
+        -> (float): Percentile value, None if no data has been set
+        """
+        if self.sketch is not None:
+            return float(self.sketch.get_quantile(q))
+        if not self.is_serie_none():
+            return self.serie.quantile(q)
+        return None
 
     #histogram function
     def set_histogram(self):
@@ -353,6 +451,8 @@ class NumericColumn:
         Description
         --------------------
         -> set_histogram (method): Class method that generates an Altair histogram of self.serie.
+        The values are binned with NumPy (see tab_num.stats.compute_histogram) so that the chart only receives one row per bin instead of the whole dataframe.
+        Infinite values cannot be binned: they are counted in self.n_infinite and reported in the summary instead.
 
         --------------------
         Parameters
@@ -365,9 +465,14 @@ class NumericColumn:
         -> None
         """
         if not self.is_serie_none():
-            self.histogram = alt.Chart(self.df).mark_bar().encode(
-                alt.X(self.serie.name, bin=True),
-                y='count()'
+            values = to_float_buffer(self.serie)
+            self.n_infinite = count_infinite(values)
+            bins = compute_histogram(values)
+            self.histogram = alt.Chart(bins).mark_bar().encode(
+                alt.X('bin_start:Q', bin='binned', title=str(self.serie.name)),
+                alt.X2('bin_end:Q'),
+                y=alt.Y('count:Q', title='Count of Records'),
+                tooltip=['bin_start', 'bin_end', 'count']
             ).properties(
                 title=f'Histogram of {self.serie.name}'
             )
@@ -378,7 +483,8 @@ class NumericColumn:
         --------------------
         Description
         --------------------
-        -> set_boxplot (method): Class method that generates an Altair box plot for the current self.serie.
+        -> set_boxplot (method): Class method that generates an Altair box plot for the current self.serie and store it in the relevant attribute (self.boxplot).
+        The quartiles, whiskers and outliers are computed with NumPy (see tab_num.stats.compute_boxplot) so that the chart only receives these few values instead of the whole dataframe.
 
         --------------------
         Parameters
@@ -391,27 +497,60 @@ class NumericColumn:
         -> (alt.Chart): Box plot for the selected numeric column.
         """
         if not self.is_serie_none():
-            boxplot = alt.Chart(self.df).mark_boxplot().encode(
-                y=alt.Y(self.serie.name, title=self.serie.name)
-            ).properties(
+            box, outliers = compute_boxplot(to_float_buffer(self.serie))
+            if box is None:
+                return None
+            name = str(self.serie.name)
+            box_df = pd.DataFrame([dict(box, column=name)])
+            outliers_df = pd.DataFrame({'column': name, 'value': outliers})
+            x = alt.X('column:N', title=None)
+
+            whiskers = alt.Chart(box_df).mark_rule().encode(
+                x=x,
+                y=alt.Y('lower:Q', title=name),
+                y2='upper:Q'
+            )
+            quartiles = alt.Chart(box_df).mark_bar(size=40).encode(
+                x=x,
+                y='q1:Q',
+                y2='q3:Q',
+                tooltip=['lower', 'q1', 'median', 'q3', 'upper']
+            )
+            median = alt.Chart(box_df).mark_tick(color='white', size=40).encode(
+                x=x,
+                y='median:Q'
+            )
+            points = alt.Chart(outliers_df).mark_point().encode(
+                x=x,
+                y='value:Q',
+                tooltip=['value']
+            )
+            self.boxplot = alt.layer(whiskers, quartiles, median, points).properties(
                 title=f'Box Plot for {self.serie.name}',
                 width=600,
                 height=400
             )
-            return boxplot
+            return self.boxplot
     
     #scatterplot function
-    def set_scatterplot(self, other_column):
+    def set_scatterplot(self, other_column, max_points=5000, max_sampled_rows=500000):
         """
         --------------------
         Description
         --------------------
         -> set_scatterplot (method): Class method that generates an Altair scatter plot between self.serie and another numeric column.
+        The way the plot is drawn depends on the number of rows without missing values (see tab_num.stats.get_scatter_mode) and is stored in self.scatter_mode:
+        - 'points': every point is plotted
+        - 'sample': a stratified random sample of max_points points is plotted
+        - 'density': the points are counted on a 2D grid and only the non empty cells are plotted
+        so that the chart payload stays bounded whatever the size of the dataset. Rows where either value is missing or infinite are left out.
 
         --------------------
         Parameters
         --------------------
         -> other_column (str): Name of the other numeric column to compare against.
+        -> max_points (int): Maximum number of points sent to the chart
+        -> max_sampled_rows (int): Maximum number of rows drawn as a sample before switching to a density plot
 
         --------------------
         Returns
@@ -419,11 +558,36 @@ class NumericColumn:
         -> (alt.Chart): Scatter plot between the selected columns.
         """
         if not self.is_serie_none() and other_column in self.df.columns:
-            scatterplot = alt.Chart(self.df).mark_circle(size=60).encode(
-                x=alt.X(self.serie.name, title=self.serie.name),
-                y=alt.Y(other_column, title=other_column),
-                tooltip=[self.serie.name, other_column]
-            ).properties(
+            name = str(self.serie.name)
+            x = to_float_buffer(self.serie)
+            y = to_float_buffer(pd.to_numeric(self.df[other_column], errors='coerce'))
+            # Missing and infinite values cannot be placed on the chart
+            valid = np.isfinite(x) & np.isfinite(y)
+            x, y = x[valid], y[valid]
+            self.scatter_mode = get_scatter_mode(len(x), max_points=max_points, max_sampled_rows=max_sampled_rows)
+
+            if self.scatter_mode == 'density':
+                cells = bin_scatter(x, y)
+                scatterplot = alt.Chart(cells).mark_rect().encode(
+                    x=alt.X('x_start:Q', bin='binned', title=name),
+                    x2='x_end:Q',
+                    y=alt.Y('y_start:Q', bin='binned', title=other_column),
+                    y2='y_end:Q',
+                    color=alt.Color('count:Q', scale=alt.Scale(type='log')),
+                    tooltip=['x_start', 'x_end', 'y_start', 'y_end', 'count']
+                )
+            else:
+                if self.scatter_mode == 'sample':
+                    positions = sample_scatter(x, n_points=max_points)
+                    x, y = x[positions], y[positions]
+                points = pd.DataFrame({'x': x, 'y': y})
+                scatterplot = alt.Chart(points).mark_circle(size=60).encode(
+                    x=alt.X('x:Q', title=name),
+                    y=alt.Y('y:Q', title=other_column),
+                    tooltip=[alt.Tooltip('x:Q', title=name), alt.Tooltip('y:Q', title=other_column)]
+                )
+
+            scatterplot = scatterplot.properties(
                 title=f'Scatter Plot: {self.serie.name} vs {other_column}',
                 width=700,
                 height=500
@@ -437,6 +601,8 @@ class NumericColumn:
         Description
         --------------------
         -> set_frequent (method): Class method that computes the DataFrame containing the most frequent values of a series.
+        Columns with more than EXACT_FREQUENT_DISTINCT unique values use a bounded FrequentItems summary (utils.sketches) instead of a full value_counts(),
+        and the DataFrame gets a max_error column with the maximum overestimation of each occurrence.
 
         --------------------
         Parameters
@@ -449,9 +615,14 @@ class NumericColumn:
         -> None
         """
         if not self.is_serie_none():
-            value_counts = self.serie.value_counts().head(end).reset_index()
-            value_counts.columns = ['value', 'occurrence']
-            value_counts['percentage'] = (value_counts['occurrence'] / len(self.serie) * 100).round(2)
+            if self.n_unique is not None and self.n_unique > EXACT_FREQUENT_DISTINCT:
+                top = FrequentItems()
+                top.update(self.serie)
+                value_counts = top.get_top(end)
+            else:
+                value_counts = self.serie.value_counts().head(end).reset_index()
+                value_counts.columns = ['value', 'occurrence']
+            value_counts.insert(2, 'percentage', (value_counts['occurrence'] / len(self.serie) * 100).round(2))
             self.frequent = value_counts
     
     #summary function:
@@ -472,7 +643,7 @@ class NumericColumn:
         --------------------
         -> (pd.DataFrame): Formatted DataFrame containing metrics and their respective values.
         """
-        if not self.is_serie_none():
+        if self.n_unique is not None:
             summary = {
                 'Unique Values': self.n_unique,
                 'Missing Values': self.n_missing,
@@ -484,5 +655,7 @@ class NumericColumn:
                 'Maximum': self.col_max,
                 'Median': self.col_median
             }
+            if self.n_infinite:
+                summary['Infinite Values'] = self.n_infinite
             return pd.DataFrame(list(summary.items()), columns=['Metric', 'Value'])
         return pd.DataFrame(columns=['Metric', 'Value'])
@@ -0,0 +1,577 @@
+import numpy as np
+import pandas as pd
+
+from utils.sketches import QuantileSketch, ValueCounter
+
+# Number of values processed at once, small enough for a block and its temporaries to stay in CPU cache
+BLOCK_SIZE = 64 * 1024
+
+
+def to_float_buffer(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> to_float_buffer (function): Function that returns the values of a numeric Pandas Series as a contiguous float64 NumPy array where missing values are NaN.
+    No copy is made when the series is already stored as float64.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Numeric Pandas Series
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Contiguous float64 array
+
+    """
+    values = serie.to_numpy(dtype="float64", na_value=np.nan)
+    return np.ascontiguousarray(values)
+
+
+class NumericStats:
+    """
+    --------------------
+    Description
+    --------------------
+    -> NumericStats (class): Class that computes the moments and extremes of numeric values in a single pass over a float buffer.
+    Values are processed block by block so that the missing, zero, negative, sum, variance, minimum and maximum computations all reuse the block while it is in CPU cache.
+    Two instances can be merged, which allows the statistics of chunks or workers to be combined.
+
+    --------------------
+    Attributes
+    --------------------
+    -> n_rows (int): Number of values seen, missing included (default set to 0)
+    -> n_missing (int): Number of missing values (default set to 0)
+    -> n_zeros (int): Number of values equal to 0 (default set to 0)
+    -> n_negatives (int): Number of negative values (default set to 0)
+    -> count (int): Number of non missing values (default set to 0)
+    -> total (float): Sum of the non missing values (default set to 0.0)
+    -> m2 (float): Sum of squared differences to the mean of the non missing values (default set to 0.0)
+    -> col_min (float): Minimum value (default set to NaN)
+    -> col_max (float): Maximum value (default set to NaN)
+
+    """
+    def __init__(self):
+        self.n_rows = 0
+        self.n_missing = 0
+        self.n_zeros = 0
+        self.n_negatives = 0
+        self.count = 0
+        self.total = 0.0
+        self.m2 = 0.0
+        self.col_min = np.nan
+        self.col_max = np.nan
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that folds an array of float values into the statistics.
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (np.ndarray): Contiguous float64 array where missing values are NaN
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        for start in range(0, len(values), BLOCK_SIZE):
+            block = values[start:start + BLOCK_SIZE]
+            missing = np.isnan(block)
+            n_missing = int(np.count_nonzero(missing))
+            valid = block[~missing] if n_missing else block
+
+            other = NumericStats()
+            other.n_rows = len(block)
+            other.n_missing = n_missing
+            other.count = len(valid)
+            if other.count:
+                other.n_zeros = int(np.count_nonzero(valid == 0))
+                other.n_negatives = int(np.count_nonzero(valid < 0))
+                other.total = float(valid.sum())
+                deviations = valid - other.total / other.count
+                other.m2 = float(np.dot(deviations, deviations))
+                other.col_min = float(valid.min())
+                other.col_max = float(valid.max())
+            self.merge(other)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines the statistics of another instance into this one, using the pairwise update of Chan et al. for the variance.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (NumericStats): Statistics computed on another part of the data
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if other.count:
+            if self.count:
+                delta = other.total / other.count - self.total / self.count
+                count = self.count + other.count
+                self.m2 += other.m2 + delta * delta * self.count * other.count / count
+                self.col_min = min(self.col_min, other.col_min)
+                self.col_max = max(self.col_max, other.col_max)
+            else:
+                self.m2 = other.m2
+                self.col_min = other.col_min
+                self.col_max = other.col_max
+        self.n_rows += other.n_rows
+        self.n_missing += other.n_missing
+        self.n_zeros += other.n_zeros
+        self.n_negatives += other.n_negatives
+        self.count += other.count
+        self.total += other.total
+
+    def get_mean(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_mean (method): Class method that returns the mean of the non missing values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (float): Mean value, NaN if there are no values
+
+        """
+        return self.total / self.count if self.count else np.nan
+
+    def get_std(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_std (method): Class method that returns the sample standard deviation (ddof=1, as Pandas) of the non missing values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (float): Standard deviation, NaN if there are less than 2 values
+
+        """
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+
+def compute_numeric_stats(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_numeric_stats (function): Function that computes NumericStats for a numeric Pandas Series.
+    The extremes of integer series are taken from their integer values, as float64 does not hold integers above 2**53 exactly.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Numeric Pandas Series
+
+    --------------------
+    Returns
+    --------------------
+    -> (NumericStats): Statistics of the series
+
+    """
+    stats = NumericStats()
+    stats.update(to_float_buffer(serie))
+    if pd.api.types.is_integer_dtype(serie.dtype) and stats.count:
+        stats.col_min = int(serie.min())
+        stats.col_max = int(serie.max())
+    return stats
+
+
+def get_nice_bin_edges(col_min, col_max, max_bins=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_nice_bin_edges (function): Function that computes histogram bin edges with a round step (1, 2 or 5 times a power of 10), as Altair does with bin=True.
+
+    --------------------
+    Parameters
+    --------------------
+    -> col_min (float): Minimum value to be binned
+    -> col_max (float): Maximum value to be binned
+    -> max_bins (int): Maximum number of bins
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Sorted bin edges covering [col_min, col_max], None if the span of the values overflows float64
+
+    """
+    span = col_max - col_min
+    if not np.isfinite(span):
+        return None
+    if span <= 0:
+        return np.array([col_min - 0.5, col_max + 0.5])
+    raw_step = span / max_bins
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    step = next(
+        factor * magnitude for factor in (1, 2, 5, 10)
+        if factor * magnitude >= raw_step
+    )
+    start = np.floor(col_min / step) * step
+    stop = np.ceil(col_max / step) * step
+    if stop <= col_max:
+        stop += step
+    if not np.isfinite(stop - start):
+        return None
+    n_bins = max(int(round((stop - start) / step)), 1)
+    return start + step * np.arange(n_bins + 1)
+
+
+def compute_histogram(values, max_bins=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_histogram (function): Function that bins numeric values with NumPy so that only the bin counts have to be sent to the chart.
+    Infinite values cannot be binned and are left out (see count_infinite). No bin is returned when the span of the values overflows float64.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Float64 array where missing values are NaN
+    -> max_bins (int): Maximum number of bins
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Dataframe with one row per bin and the columns bin_start, bin_end and count
+
+    """
+    valid = values[np.isfinite(values)]
+    if len(valid) == 0:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "count"])
+    edges = get_nice_bin_edges(float(valid.min()), float(valid.max()), max_bins=max_bins)
+    if edges is None:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "count"])
+    counts, edges = np.histogram(valid, bins=edges)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+def count_infinite(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> count_infinite (function): Function that counts the infinite values left out of the histogram, box plot and scatter plot.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Float64 array where missing values are NaN
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Number of inf and -inf values
+
+    """
+    return int(np.count_nonzero(np.isinf(values)))
+
+
+def compute_boxplot(values, max_outliers=500):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_boxplot (function): Function that computes the quartiles, whiskers (1.5 times the interquartile range, as Altair does) and outliers of numeric values.
+    When there are more outliers than max_outliers, they are evenly picked across their sorted values so that the extremes are kept. Infinite values are left out, as in compute_histogram.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Float64 array where missing values are NaN
+    -> max_outliers (int): Maximum number of outliers returned
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Dictionary with the keys lower, q1, median, q3 and upper, and array of outliers. (None, None) if there are no values.
+
+    """
+    valid = values[np.isfinite(values)]
+    if len(valid) == 0:
+        return None, None
+    q1, median, q3 = np.percentile(valid, [25, 50, 75])
+    iqr = q3 - q1
+    inside = valid[(valid >= q1 - 1.5 * iqr) & (valid <= q3 + 1.5 * iqr)]
+    box = {
+        "lower": float(inside.min()),
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "upper": float(inside.max()),
+    }
+    outliers = np.sort(valid[(valid < box["lower"]) | (valid > box["upper"])])
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).astype(int)]
+    return box, outliers
+
+
+def get_scatter_mode(n_rows, max_points=5000, max_sampled_rows=500000):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_scatter_mode (function): Function that picks how a scatter plot is drawn from its number of rows:
+    every point up to max_points, a stratified sample of max_points up to max_sampled_rows, and a 2D binned density above.
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of plotted rows
+    -> max_points (int): Maximum number of points sent to the chart
+    -> max_sampled_rows (int): Maximum number of rows drawn as a sample before switching to binning
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): 'points', 'sample' or 'density'
+
+    """
+    if n_rows <= max_points:
+        return "points"
+    if n_rows <= max_sampled_rows:
+        return "sample"
+    return "density"
+
+
+def sample_scatter(x, n_points=5000, n_strata=20, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> sample_scatter (function): Function that draws a random sample of the rows of a scatter plot stratified on quantiles of x,
+    so that sparse ranges of x keep at least one point while every stratum is sampled proportionally to its size.
+
+    --------------------
+    Parameters
+    --------------------
+    -> x (np.ndarray): Float64 array of x values without missing values
+    -> n_points (int): Maximum number of sampled points
+    -> n_strata (int): Number of quantile strata of x
+    -> seed (int): Seed of the random generator, so that reruns show the same sample
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Sorted positions of the sampled rows
+
+    """
+    rng = np.random.default_rng(seed)
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, n_strata + 1)[1:-1]))
+    strata = np.searchsorted(edges, x, side="right")
+    order = np.argsort(strata, kind="stable")
+    bounds = np.searchsorted(strata[order], np.arange(len(edges) + 2))
+    sampled = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop > start:
+            size = min(max(1, int(round(n_points * (stop - start) / len(x)))), stop - start)
+            sampled.append(rng.choice(order[start:stop], size=size, replace=False))
+    sampled = np.concatenate(sampled)
+    # Rounding up small strata can go slightly above n_points
+    if len(sampled) > n_points:
+        sampled = rng.choice(sampled, size=n_points, replace=False)
+    return np.sort(sampled)
+
+
+def bin_scatter(x, y, n_bins=50):
+    """
+    --------------------
+    Description
+    --------------------
+    -> bin_scatter (function): Function that counts (x, y) pairs on a 2D grid so that a density plot only receives the non empty cells.
+    Pairs with an infinite value are left out, as the grid has to cover a finite range, and no cell is returned when the range of an axis overflows float64.
+
+    --------------------
+    Parameters
+    --------------------
+    -> x (np.ndarray): Float64 array of x values without missing values
+    -> y (np.ndarray): Float64 array of y values without missing values
+    -> n_bins (int): Number of bins along each axis
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Dataframe with one row per non empty cell and the columns x_start, x_end, y_start, y_end and count
+
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) and not (np.isfinite(x.max() - x.min()) and np.isfinite(y.max() - y.min())):
+        return pd.DataFrame(columns=["x_start", "x_end", "y_start", "y_end", "count"])
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=n_bins)
+    x_index, y_index = np.nonzero(counts)
+    return pd.DataFrame({
+        "x_start": x_edges[x_index],
+        "x_end": x_edges[x_index + 1],
+        "y_start": y_edges[y_index],
+        "y_end": y_edges[y_index + 1],
+        "count": counts[x_index, y_index].astype(int),
+    })
+
+
+def get_weighted_median(values, counts):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_weighted_median (function): Function that computes the median of values given with their number of occurrences, averaging the two middle values for an even total as Pandas does.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Distinct values without missing values
+    -> counts (np.ndarray): Number of occurrences of each value
+
+    --------------------
+    Returns
+    --------------------
+    -> (float): Median value, NaN if there are no values
+
+    """
+    total = int(np.sum(counts))
+    if total == 0:
+        return np.nan
+    order = np.argsort(values)
+    values = np.asarray(values, dtype="float64")[order]
+    cumulative = np.cumsum(np.asarray(counts)[order])
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, total // 2, side="right")]
+    return (lower + upper) / 2
+
+
+class NumericAccumulator:
+    """
+    --------------------
+    Description
+    --------------------
+    -> NumericAccumulator (class): Class that builds the NumericColumn profile of a numeric column from the chunks of a tab_df.streaming.StreamingDataset, each chunk being converted with pd.to_numeric as convert_serie_to_num does.
+    Moments, extremes and the zero, negative and missing counts go to a NumericStats. Distinct values go to a ValueCounter, which gives the unique count, the exact median
+    and the most frequent values while the column has few distinct values. Every value also goes to a QuantileSketch, which gives the median once the counts are approximate
+    and the percentiles of the box plot. Accumulators of separate chunks or workers are combined with merge().
+
+    --------------------
+    Attributes
+    --------------------
+    -> stats (NumericStats): Moments and extremes of the values seen so far
+    -> values (ValueCounter): Counts of the distinct values seen so far
+    -> sketch (QuantileSketch): Quantile sketch of the values seen so far
+
+    """
+    def __init__(self):
+        self.stats = NumericStats()
+        self.values = ValueCounter()
+        self.sketch = QuantileSketch()
+
+    def update(self, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that folds a chunk of a column into the accumulator, converting it to a numeric type as NumericColumn does.
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Chunk of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        serie = pd.to_numeric(serie, errors="coerce")
+        values = to_float_buffer(serie)
+        self.stats.merge(compute_numeric_stats(serie))
+        self.sketch.update(values)
+        self.values.update_counts(serie.value_counts())
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another accumulator of the same column into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (NumericAccumulator): Accumulator computed on other chunks of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.values.merge(other.values)
+
+    def finalize(self, analyzer, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> finalize (method): Class method that stores the accumulated results in the attributes of a tab_num.logics.NumericColumn so that its get_summary() and frequent can be displayed.
+
+        --------------------
+        Parameters
+        --------------------
+        -> analyzer (NumericColumn): Analyzer to be filled
+        -> end (int): The maximum number of top values to be kept in analyzer.frequent
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        analyzer.n_unique = self.values.get_n_unique()
+        analyzer.n_missing = self.stats.n_missing
+        analyzer.n_zeros = self.stats.n_zeros
+        analyzer.n_negatives = self.stats.n_negatives
+        analyzer.col_mean = round(self.stats.get_mean(), 2)
+        analyzer.col_std = round(self.stats.get_std(), 2)
+        analyzer.col_min = self.stats.col_min
+        analyzer.col_max = self.stats.col_max
+        if self.values.is_exact():
+            analyzer.col_median = get_weighted_median(self.values.counts.index.to_numpy(), self.values.counts.to_numpy())
+        else:
+            analyzer.col_median = self.sketch.get_median()
+        analyzer.sketch = self.sketch
+
+        frequent = self.values.get_top(end)
+        frequent.insert(2, "percentage", (frequent["occurrence"] / self.stats.n_rows * 100).round(2))
+        analyzer.frequent = frequent
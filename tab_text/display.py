@@ -2,7 +2,7 @@ import streamlit as st
 
 from tab_text.logics import TextColumn
 
-def display_tab_text_content(file_path=None, df=None):
+def display_tab_text_content(file_path=None, df=None, dataset=None):
     """
     --------------------
     Description
@@ -14,12 +14,14 @@ def display_tab_text_content(file_path=None, df=None):
     - the results of tab_text.logics.TextColumn.get_summary() as a Streamlit Table
     - the graph from tab_text.logics.TextColumn.histogram using Streamlit.altair_chart()
     - the results of tab_text.logics.TextColumn.frequent using Streamlit.write
+    If a tab_df.streaming.StreamingDataset is provided, the results of its chunked profile are displayed instead and the bar chart is skipped.
  
     --------------------
     Parameters
     --------------------
     -> file_path (str): File path to uploaded CSV file (optional)
     -> df (pd.DataFrame): Loaded dataframe (optional)
+    -> dataset (StreamingDataset): Dataset profiled chunk by chunk (optional)
 
     --------------------
     Returns
@@ -32,14 +34,20 @@ def display_tab_text_content(file_path=None, df=None):
     st.session_state["text_column"] = TextColumn(file_path=file_path, df=df)
 
     # Call the find_text_cols() to filter columns with textual data
-    st.session_state.text_column.find_text_cols()
+    if dataset is not None:
+        st.session_state.text_column.cols_list = dataset.text_cols_list
+    else:
+        st.session_state.text_column.find_text_cols()
 
     # Set the selected text column in a variable
     option = st.selectbox("Which text column do you want to explore", st.session_state.text_column.cols_list)
     
     # Set the selected option in the session state
     try:
-        st.session_state.text_column.set_data(option)
+        if dataset is not None:
+            dataset.set_column(st.session_state.text_column, option)
+        else:
+            st.session_state.text_column.set_data(option)
     except Exception:
         st.error("There was an error encountered while reading the file")
         exit()
@@ -51,8 +59,9 @@ def display_tab_text_content(file_path=None, df=None):
         st.table(data=st.session_state.text_column.get_summary())
 
         # Create a bar chart showing the number of occurrence for each value
-        st.subheader("Bar Chart")
-        st.altair_chart(st.session_state.text_column.barchart, use_container_width=True)
+        if dataset is None:
+            st.subheader("Bar Chart")
+            st.altair_chart(st.session_state.text_column.barchart, use_container_width=True)
         
         # Create a table listing the occurrences and percentage of the top 20 most frequent values
         st.subheader("Most Frequent Values")
@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 import altair as alt
 
+from utils.cache import load_columns, load_profile, save_profile
+from utils.dtypes import TEXT_DTYPES
+from utils.sketches import APPROX_DISTINCT_ROWS, EXACT_FREQUENT_DISTINCT, FrequentItems, count_distinct
+from tab_text.stats import count_char_classes
+
+# Number of most frequent values drawn in the barchart, the other values are grouped in a single bar
+BARCHART_TOP_VALUES = 20
+
 class TextColumn:
     """
     --------------------
@@ -13,6 +22,7 @@ class TextColumn:
     --------------------
     -> file_path (str): Path to the uploaded CSV file (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
+    -> approx_distinct (bool): True to count unique values with a HyperLogLog, False to count them exactly, None to only approximate long series (default set to None)
     -> cols_list (list): List of columns names of dataset that are text type (default set to empty list)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
     -> n_unique (int): Number of unique value of a serie (default set to None)
@@ -24,13 +34,16 @@ class TextColumn:
     -> n_upper (int): Number of times a serie has only uppercase characters (default set to None)
     -> n_alpha (int): Number of times a serie has only alphabetical characters (default set to None)
     -> n_digit (int): Number of times a serie has only digit characters (default set to None)
-    -> barchart (alt.Chart): Altair barchart displaying the count for each value of a serie (default set to empty)
+    -> value_counts (pd.Series): Number of occurrences of each unique value of a serie sorted from the most frequent, shared by the string checks, mode, barchart and frequent table (default set to None)
+    -> value_errors (pd.Series): Maximum overestimation of each count of value_counts when it comes from a FrequentItems summary, None when the counts are exact (default set to None)
+    -> barchart (alt.Chart): Altair barchart displaying the count of the most frequent values of a serie (default set to empty)
     -> frequent (pd.DataFrame): Datframe containing the most frequest value of a serie (default set to empty)
 
     """
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, approx_distinct=None):
         self.file_path = file_path
         self.df = df
+        self.approx_distinct = approx_distinct
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -42,6 +55,8 @@ class TextColumn:
         self.n_upper = None
         self.n_alpha = None
         self.n_digit = None
+        self.value_counts = None
+        self.value_errors = None
         self.barchart = alt.Chart()
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
     
@@ -68,10 +83,10 @@ class TextColumn:
         # If dataframe is not passed, read it from the file path
         if self.df is None:
     
-            self.df = pd.read_csv(self.file_path)
+            self.df = load_columns(self.file_path, include=TEXT_DTYPES)[1]
         
         # Filter all the text columns from the dataframe
-        self.cols_list = self.df.select_dtypes(include="object").columns.tolist()
+        self.cols_list = self.df.select_dtypes(include=TEXT_DTYPES).columns.tolist()
         
 
     def set_data(self, col_name):
@@ -95,21 +110,23 @@ class TextColumn:
         -> None
         """
 
+        # Reuse the values and charts already computed for this column
+        if load_profile(self, col_name):
+            return
+
         # Save the column values to a class variable 'serie'
         self.serie = self.df[col_name]
 
         # If column has values, convert it to string type and compute and set all values to be displayed into class variables
         if not self.is_serie_none():
             self.convert_serie_to_text()
-        
-            self.set_unique()
+
+            # Count the unique values and the occurrences of each of them once, the other values are computed from these counts
+            self.set_value_counts()
+
             self.set_missing()
             self.set_empty()
-            self.set_whitespace()
-            self.set_lowercase()
-            self.set_uppercase()
-            self.set_alphabet()
-            self.set_digit()
+            self.set_char_classes()
             self.set_mode()
 
             # Set the barchart class variable as the altair chart object
@@ -117,6 +134,9 @@ class TextColumn:
 
             # Set the values, occurrence and percentages in the frequent class variable
             self.set_frequent()
+
+            # Save the computed values so that selecting this column again is instant
+            save_profile(self, col_name)
         
 
     def convert_serie_to_text(self):
@@ -125,6 +145,8 @@ class TextColumn:
         Description
         --------------------
         -> convert_serie_to_text (method): Class method that convert a Pandas Series to text data type and store the results in the relevant attribute (self.serie).
+        Arrow-backed strings (memory-mapped by utils.storage.read_store) are already text and are kept as they are, so that the column is not copied into Python objects.
+        Their missing values are then read as the text 'nan', as astype(str) writes them, by the methods counting the values (see get_text_serie).
 
         --------------------
         Parameters
@@ -137,9 +159,56 @@ class TextColumn:
         -> None
 
         """
-        
+        if self.is_arrow_text():
+            return
+        if self.serie.dtype != object:
+            # Categories made by utils.dtypes.optimize_dtypes can hold Arrow-backed strings and pd.NA, convert them to NaN so that they are shown as 'nan' as with object columns
+            self.serie = pd.Series(self.serie.to_numpy(dtype=object, na_value=np.nan), index=self.serie.index, name=self.serie.name)
         self.serie = self.serie.astype(str)
 
+    def is_arrow_text(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_arrow_text (method): Class method that checks if self.serie holds Arrow-backed strings, which convert_serie_to_text keeps without conversion.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): True if self.serie is Arrow-backed text, False otherwise
+
+        """
+        return isinstance(self.serie.dtype, (pd.ArrowDtype, pd.StringDtype))
+
+    def get_text_serie(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_text_serie (method): Class method that returns self.serie with its missing values as the text 'nan', as astype(str) writes them.
+        For Arrow-backed strings with missing values this is a temporary Arrow copy, other series are returned as they are.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.Series): Text serie without missing values
+
+        """
+        if self.is_arrow_text() and self.serie.hasnans:
+            return self.serie.fillna('nan')
+        return self.serie
+
     def is_serie_none(self):
         """
         --------------------
@@ -168,6 +237,7 @@ class TextColumn:
         Description
         --------------------
         -> set_unique (method): Class method that computes the number of unique value of a serie and store the results in the relevant attribute(self.n_unique).
+        The count is estimated with a HyperLogLog for long series or when self.approx_distinct is True (see utils.sketches.count_distinct).
 
         --------------------
         Parameters
@@ -181,7 +251,7 @@ class TextColumn:
 
         """
 
-        self.n_unique = self.serie.nunique()
+        self.n_unique = count_distinct(self.get_text_serie(), approximate=self.approx_distinct)
         
 
     def set_missing(self):
@@ -202,8 +272,8 @@ class TextColumn:
         -> None
 
         """
-        
-        self.n_missing = self.serie.isna().sum()
+        # Missing values of Arrow-backed strings are read as the text 'nan' (see get_text_serie), as astype(str) has written them in object columns
+        self.n_missing = 0 if self.is_arrow_text() else self.serie.isna().sum()
 
     def set_empty(self):
         """
@@ -223,7 +293,10 @@ class TextColumn:
         -> None
 
         """
-        self.n_empty = self.serie.eq("").sum()
+        if self.value_counts is not None and self.value_errors is None:
+            self.n_empty = int(self.value_counts.get("", 0))
+        else:
+            self.n_empty = self.get_text_serie().eq("").sum()
         
 
     def set_mode(self):
@@ -231,7 +304,34 @@ class TextColumn:
         --------------------
         Description
         --------------------
-        -> set_mode (method): Class method that computes the mode value of a serie and store the results in the relevant attribute(self.n_mode).
+        -> set_mode (method): Class method that finds the mode value of a serie from self.value_counts and store the results in the relevant attribute(self.n_mode).
+        As Series.mode(), ties are broken by taking the smallest value.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.value_counts is None or self.value_counts.empty:
+            self.n_mode = None
+            return
+        top = self.value_counts.iloc[0]
+        self.n_mode = min(self.value_counts.index[self.value_counts.values == top])
+
+    def set_char_classes(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_char_classes (method): Class method that classifies every unique value of a serie once, weighted by its number of occurrences (see tab_text.stats.count_char_classes), and store the number of values
+        with only space, lowercase, uppercase, alphabetical and digit characters in the relevant attributes (self.n_space, self.n_lower, self.n_upper, self.n_alpha and self.n_digit).
+        It gives the same results as set_whitespace(), set_lowercase(), set_uppercase(), set_alphabet() and set_digit() in a single pass.
 
         --------------------
         Parameters
@@ -244,7 +344,15 @@ class TextColumn:
         -> None
 
         """
-        self.n_mode = self.serie.mode()[0]
+        if self.value_counts is not None and self.value_errors is None:
+            classes = count_char_classes(self.value_counts.index, self.value_counts.to_numpy())
+        else:
+            classes = count_char_classes(self.get_text_serie().to_numpy())
+        self.n_space = classes["space"]
+        self.n_lower = classes["lower"]
+        self.n_upper = classes["upper"]
+        self.n_alpha = classes["alpha"]
+        self.n_digit = classes["digit"]
 
     def set_whitespace(self):
         """
@@ -264,7 +372,7 @@ class TextColumn:
         -> None
 
         """
-        self.n_space = self.serie.str.isspace().sum()
+        self.n_space = self.get_text_serie().str.isspace().sum()
 
     def set_lowercase(self):
         """
@@ -284,7 +392,7 @@ class TextColumn:
         -> None
 
         """
-        self.n_lower = self.serie.str.islower().sum()
+        self.n_lower = self.get_text_serie().str.islower().sum()
         
 
     def set_uppercase(self):
@@ -305,7 +413,7 @@ class TextColumn:
         -> None
 
         """
-        self.n_upper = self.serie.str.isupper().sum()
+        self.n_upper = self.get_text_serie().str.isupper().sum()
         
     
     def set_alphabet(self):
@@ -326,7 +434,7 @@ class TextColumn:
         -> None
 
         """
-        self.n_alpha = self.serie.str.isalpha().sum()
+        self.n_alpha = self.get_text_serie().str.isalpha().sum()
         
 
     def set_digit(self):
@@ -347,33 +455,110 @@ class TextColumn:
         -> None
 
         """
-        self.n_digit = self.serie.str.isdigit().sum()
+        self.n_digit = self.get_text_serie().str.isdigit().sum()
+
+    def set_value_counts(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_value_counts (method): Class method that dictionary-encodes a serie with a single pd.factorize() and counts the occurrences of each unique value from the codes,
+        then store the number of unique values and the counts sorted from the most frequent in the relevant attributes (self.n_unique, self.value_counts and self.value_errors).
+        As most text columns have far fewer unique values than rows, the other checks are run on these unique values and weighted by their counts.
+        Columns with more than EXACT_FREQUENT_DISTINCT unique values only keep the most frequent ones in a bounded FrequentItems (utils.sketches), and the other checks are run on the whole serie.
+        When the unique values are approximated (see utils.sketches.count_distinct), they are counted with a HyperLogLog first, and columns above EXACT_FREQUENT_DISTINCT are never factorized.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
 
-    def set_barchart(self):  
+        """
+        approximate = self.approx_distinct
+        if approximate is None:
+            approximate = len(self.serie) > APPROX_DISTINCT_ROWS
+        top = FrequentItems()
+        if approximate:
+            self.n_unique = count_distinct(self.get_text_serie(), approximate=True)
+            if self.n_unique > EXACT_FREQUENT_DISTINCT:
+                top.update(self.get_text_serie())
+                self.set_value_summary(top)
+                return
+
+        codes, uniques = pd.factorize(self.serie, use_na_sentinel=False)
+        if self.is_arrow_text():
+            # Only the unique values are converted to Python strings, missing values becoming 'nan' as with astype(str)
+            uniques = pd.Index(uniques.to_numpy(dtype=object, na_value=np.nan)).astype(str)
+        if not approximate:
+            self.n_unique = len(uniques)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(-counts, kind='stable')
+        self.value_counts = pd.Series(counts[order], index=uniques.take(order))
+        self.value_errors = None
+        if len(uniques) > EXACT_FREQUENT_DISTINCT:
+            top.update_counts(self.value_counts)
+            self.set_value_summary(top)
+
+    def set_value_summary(self, top):
         """
         --------------------
         Description
         --------------------
-        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for each value of a serie and store the results in the relevant attribute(self.barchart).
+        -> set_value_summary (method): Class method that stores the most frequent values kept by a FrequentItems summary, with the maximum overestimation of their counts,
+        in the relevant attributes (self.value_counts and self.value_errors).
 
         --------------------
         Parameters
         --------------------
+        -> top (FrequentItems): Summary of the values of the serie
+
+        --------------------
+        Returns
+        --------------------
         -> None
 
+        """
+        summary = top.get_top(top.capacity)
+        self.value_counts = pd.Series(summary['occurrence'].values, index=summary['value'].values)
+        self.value_errors = pd.Series(summary['max_error'].values, index=summary['value'].values)
+
+    def set_barchart(self, top=BARCHART_TOP_VALUES):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_barchart (method): Class method that computes the Altair barchart displaying the count of the most frequent values of a serie and store the results in the relevant attribute(self.barchart).
+        The remaining values are grouped in a single "Other" bar so that the size of the chart does not grow with the number of unique values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> top (int): Maximum number of values drawn with their own bar
+
         --------------------
         Returns
         --------------------
         -> None
 
         """
-        # Get the number of times each unique value occurs in the column
-        df_value_counts = self.serie.value_counts().reset_index()
+        # Get the number of times the most frequent values occur in the column
+        counts = self.value_counts.head(top)
+        df_value_counts = pd.DataFrame({'value': counts.index.astype(str), 'count': counts.values})
+
+        # Group every other value in a single bar
+        n_other = max(len(self.serie) - int(counts.sum()), 0)
+        if n_other > 0:
+            df_value_counts.loc[len(df_value_counts)] = ['Other', n_other]
 
         self.barchart = (
             alt.Chart(df_value_counts)
             .mark_bar()
-            .encode(x=alt.X(df_value_counts.columns[0], sort='-y'), y=df_value_counts.columns[1])
+            .encode(x=alt.X('value', sort=None), y='count')
         )
         
       
@@ -382,7 +567,8 @@ class TextColumn:
         --------------------
         Description
         --------------------
-        -> set_frequent (method): Class method that computes the Dataframe containing the most frequest value of a serie and store the results in the relevant attribute(self.frequent).
+        -> set_frequent (method): Class method that computes the Dataframe containing the most frequest value of a serie from self.value_counts and store the results in the relevant attribute(self.frequent).
+        When the counts come from a FrequentItems summary, the Dataframe gets a max_error column with the maximum overestimation of each occurrence.
 
         --------------------
         Parameters
@@ -396,12 +582,15 @@ class TextColumn:
         -> None
 
         """
-
-        self.frequent['value'] = self.serie.value_counts(normalize=False, sort=True, ascending=False).index
-        self.frequent['occurrence'] = self.serie.value_counts(normalize=False, sort=True, ascending=False).values
-        self.frequent['percentage'] = self.serie.value_counts(normalize=True, sort=True, ascending=False).values
-
-        self.frequent = self.frequent.head(end)
+        counts = self.value_counts.head(end)
+        frequent = pd.DataFrame({
+            'value': counts.index,
+            'occurrence': counts.values,
+            'percentage': counts.values / len(self.serie)
+        })
+        if self.value_errors is not None:
+            frequent['max_error'] = self.value_errors.head(end).values
+        self.frequent = frequent
         
 
     def get_summary(self):
@@ -0,0 +1,194 @@
+import numpy as np
+
+from utils.sketches import ValueCounter
+
+# Bit set in the class mask of a string for each character class, in the order of CHAR_CLASSES
+CHAR_CLASSES = ("space", "lower", "upper", "alpha", "digit")
+
+
+def classify_strings(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> classify_strings (function): Function that classifies every string of an array in a single pass and returns one bit mask per string,
+    with the bit i set if the string satisfies the i-th check of CHAR_CLASSES (str.isspace, str.islower, str.isupper, str.isalpha and str.isdigit).
+    It replaces one Python-level pass and one boolean Series per check with a single loop over the strings.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (iterable): Strings to be classified
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Class mask of each string as uint8
+
+    """
+    return np.fromiter(
+        (
+            s.isspace() | s.islower() << 1 | s.isupper() << 2 | s.isalpha() << 3 | s.isdigit() << 4
+            for s in values
+        ),
+        dtype=np.uint8,
+        count=len(values),
+    )
+
+
+def count_char_classes(values, counts=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> count_char_classes (function): Function that counts the strings of each character class of CHAR_CLASSES with classify_strings().
+    The masks are tallied with a single np.bincount, optionally weighted by the number of occurrences of each string.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (iterable): Strings to be classified
+    -> counts (np.ndarray): Number of occurrences of each string (default set to None for one occurrence each)
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Number of strings of each character class, keyed by the names of CHAR_CLASSES
+
+    """
+    masks = classify_strings(values)
+    tally = np.bincount(masks, weights=counts, minlength=1 << len(CHAR_CLASSES))
+    bins = np.arange(len(tally))
+    return {
+        name: int(tally[(bins >> bit) & 1 == 1].sum())
+        for bit, name in enumerate(CHAR_CLASSES)
+    }
+
+
+class TextAccumulator:
+    """
+    --------------------
+    Description
+    --------------------
+    -> TextAccumulator (class): Class that builds the TextColumn profile of a text column from the chunks of a tab_df.streaming.StreamingDataset.
+    Each chunk is counted once with value_counts(), so the empty and character-class checks run on its distinct strings only, weighted by their counts.
+    The counts are added to a ValueCounter, from which finalize() takes the unique count, the mode (the smallest of the most frequent values, as Series.mode()) and the frequent values.
+    Missing values are read as the text 'nan' as in TextColumn.convert_serie_to_text, so no missing count is kept.
+
+    --------------------
+    Attributes
+    --------------------
+    -> n_rows (int): Number of values seen (default set to 0)
+    -> n_empty (int): Number of empty values (default set to 0)
+    -> n_space (int): Number of values with only space characters (default set to 0)
+    -> n_lower (int): Number of values with only lowercase characters (default set to 0)
+    -> n_upper (int): Number of values with only uppercase characters (default set to 0)
+    -> n_alpha (int): Number of values with only alphabetical characters (default set to 0)
+    -> n_digit (int): Number of values with only digit characters (default set to 0)
+    -> values (ValueCounter): Counts of the distinct values seen so far
+
+    """
+    def __init__(self):
+        self.n_rows = 0
+        self.n_empty = 0
+        self.n_space = 0
+        self.n_lower = 0
+        self.n_upper = 0
+        self.n_alpha = 0
+        self.n_digit = 0
+        self.values = ValueCounter()
+
+    def update(self, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that folds a chunk of a column into the accumulator, converting it to text as TextColumn does.
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Chunk of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        counts = serie.astype(str).value_counts()
+        self.n_rows += len(serie)
+        self.n_empty += int(counts.get("", 0))
+        classes = count_char_classes(counts.index, counts.to_numpy())
+        self.n_space += classes["space"]
+        self.n_lower += classes["lower"]
+        self.n_upper += classes["upper"]
+        self.n_alpha += classes["alpha"]
+        self.n_digit += classes["digit"]
+        self.values.update_counts(counts)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another accumulator of the same column into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (TextAccumulator): Accumulator computed on other chunks of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        self.n_rows += other.n_rows
+        self.n_empty += other.n_empty
+        self.n_space += other.n_space
+        self.n_lower += other.n_lower
+        self.n_upper += other.n_upper
+        self.n_alpha += other.n_alpha
+        self.n_digit += other.n_digit
+        self.values.merge(other.values)
+
+    def finalize(self, analyzer, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> finalize (method): Class method that stores the accumulated results in the attributes of a tab_text.logics.TextColumn so that its get_summary() and frequent can be displayed.
+
+        --------------------
+        Parameters
+        --------------------
+        -> analyzer (TextColumn): Analyzer to be filled
+        -> end (int): The maximum number of top values to be kept in analyzer.frequent
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        analyzer.n_unique = self.values.get_n_unique()
+        analyzer.n_missing = 0
+        analyzer.n_empty = self.n_empty
+        analyzer.n_space = self.n_space
+        analyzer.n_lower = self.n_lower
+        analyzer.n_upper = self.n_upper
+        analyzer.n_alpha = self.n_alpha
+        analyzer.n_digit = self.n_digit
+
+        frequent = self.values.get_top(end)
+        # As Series.mode(), ties are broken by taking the smallest value
+        if self.values.is_exact() and len(self.values.counts):
+            counts = self.values.counts
+            analyzer.n_mode = sorted(counts.index[counts == counts.max()])[0]
+        elif len(frequent):
+            top = frequent["occurrence"].iloc[0]
+            analyzer.n_mode = sorted(frequent.loc[frequent["occurrence"] == top, "value"])[0]
+        frequent.insert(2, "percentage", frequent["occurrence"] / self.n_rows)
+        analyzer.frequent = frequent
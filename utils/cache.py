@@ -0,0 +1,512 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.dtypes import optimize_dtypes
+from utils.storage import read_snapshot, read_snapshot_dtypes, read_store, write_snapshot, write_store
+
+# Maximum number of parsed datasets and total bytes kept in memory by dataset_cache
+DATASET_CACHE_ITEMS = 4
+DATASET_CACHE_BYTES = 2 * 1024 ** 3
+
+# Maximum total bytes of column profiles kept in memory by profile_cache
+PROFILE_CACHE_BYTES = 512 * 1024 ** 2
+
+# Maximum total bytes of converted date columns kept in memory by date_cache
+DATE_CACHE_BYTES = 512 * 1024 ** 2
+
+# Attributes of the column analyzers that describe the whole dataset rather than the profiled column
+DATASET_ATTRIBUTES = ("file_path", "df", "cols_list", "date_formats", "parsed_cols")
+
+# Attributes of the column analyzers that are not stored in profile_cache: the dataset ones, and the converted column itself, which can be rebuilt from the dataframe
+PROFILE_SKIPPED_ATTRIBUTES = DATASET_ATTRIBUTES + ("serie",)
+
+# Size of the blocks read from disk when hashing a file
+HASH_BLOCK_SIZE = 8 * 1024 ** 2
+
+
+def get_size(value):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_size (function): Function that returns the approximate number of bytes held by a cached value.
+    Pandas objects are measured with memory_usage(), with deep introspection of object columns as their Python strings are most of their size.
+    Dictionaries, lists, tuples and sets are measured recursively, as are the attributes of other objects, such as the accumulators of a streaming dataset.
+
+    --------------------
+    Parameters
+    --------------------
+    -> value (object): Value to be measured
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Approximate size of the value in bytes
+
+    """
+    if isinstance(value, pd.DataFrame):
+        deep = any(dtype == object for dtype in value.dtypes)
+        return int(value.memory_usage(index=True, deep=deep).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=value.dtype == object))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(get_size(item) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(get_size(item) for item in value)
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (value.nbytes if value.base is not None else 0)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + get_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    --------------------
+    Description
+    --------------------
+    -> LRUCache (class): Thread-safe cache that keeps the most recently used values and evicts the least recently used ones
+    once the number of items or their total size goes above the configured limits.
+    As Python modules are only imported once per process, a cache created at module level is shared by every Streamlit rerun and session.
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_items (int): Maximum number of values kept in the cache (default set to None for no limit)
+    -> max_bytes (int): Maximum total size in bytes of the values kept in the cache (default set to None for no limit)
+    -> sizeof (function): Function used to measure the size of a value in bytes (default set to get_size)
+    -> items (OrderedDict): Cached values ordered from least to most recently used
+    -> sizes (dict): Size in bytes of each cached value
+    -> n_bytes (int): Total size in bytes of the cached values
+    -> lock (threading.RLock): Lock protecting the cache from concurrent Streamlit sessions
+
+    """
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof if sizeof is not None else get_size
+        self.items = OrderedDict()
+        self.sizes = {}
+        self.n_bytes = 0
+        self.lock = threading.RLock()
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.items
+
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+    def get(self, key, default=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get (method): Class method that returns the value stored for a key and marks it as the most recently used one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (hashable): Key of the value to be retrieved
+        -> default (object): Value returned if the key is not cached (default set to None)
+
+        --------------------
+        Returns
+        --------------------
+        -> (object): Cached value or default
+
+        """
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        """
+        --------------------
+        Description
+        --------------------
+        -> put (method): Class method that stores a value for a key and then evicts the least recently used values until the cache fits its limits.
+        A value bigger than max_bytes on its own is not cached.
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (hashable): Key of the value to be stored
+        -> value (object): Value to be stored
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        size = self.sizeof(value)
+        with self.lock:
+            self.pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self.items[key] = value
+            self.sizes[key] = size
+            self.n_bytes += size
+            self.evict()
+
+    def pop(self, key, default=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> pop (method): Class method that removes a key from the cache and returns its value.
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (hashable): Key of the value to be removed
+        -> default (object): Value returned if the key is not cached (default set to None)
+
+        --------------------
+        Returns
+        --------------------
+        -> (object): Removed value or default
+
+        """
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.n_bytes -= self.sizes.pop(key)
+            return self.items.pop(key)
+
+    def evict(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> evict (method): Class method that removes the least recently used values until the cache fits max_items and max_bytes.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            while self.items and (
+                (self.max_items is not None and len(self.items) > self.max_items)
+                or (self.max_bytes is not None and self.n_bytes > self.max_bytes)
+            ):
+                key = next(iter(self.items))
+                self.pop(key)
+
+    def clear(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> clear (method): Class method that removes every value from the cache.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            self.items.clear()
+            self.sizes.clear()
+            self.n_bytes = 0
+
+
+# Parsed dataframes shared by every rerun, tab and session, keyed by the content hash of the uploaded file
+dataset_cache = LRUCache(max_items=DATASET_CACHE_ITEMS, max_bytes=DATASET_CACHE_BYTES)
+
+# Computed attributes of NumericColumn, TextColumn and DateColumn, keyed by dataset fingerprint, column name, analyzer type and optimization flag (see make_profile_key)
+profile_cache = LRUCache(max_bytes=PROFILE_CACHE_BYTES)
+
+# Date columns detected by DateColumn.find_date_cols, keyed by (fingerprint, "formats"), and their converted series, keyed by (fingerprint, "parsed", column name)
+date_cache = LRUCache(max_bytes=DATE_CACHE_BYTES)
+
+# Content hashes of uploaded files, keyed by upload id and size so that a file is only hashed once per upload
+fingerprint_cache = LRUCache(max_items=64)
+
+
+def get_fingerprint(file_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_fingerprint (function): Function that computes the content hash of an uploaded file or of a file on disk.
+    Hashes of Streamlit uploads are remembered by upload id so that reruns do not hash the same bytes again.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str or UploadedFile): Path to a CSV file or file-like object returned by Streamlit file_uploader
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Hexadecimal content hash of the file
+
+    """
+    upload_key = None
+    if hasattr(file_path, "id") and hasattr(file_path, "size"):
+        upload_key = (file_path.id, file_path.size)
+        fingerprint = fingerprint_cache.get(upload_key)
+        if fingerprint is not None:
+            return fingerprint
+
+    hasher = hashlib.blake2b(digest_size=16)
+    if hasattr(file_path, "getbuffer"):
+        hasher.update(file_path.getbuffer())
+    elif hasattr(file_path, "read"):
+        position = file_path.tell()
+        file_path.seek(0)
+        for block in iter(lambda: file_path.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+        file_path.seek(position)
+    else:
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                hasher.update(block)
+    fingerprint = hasher.hexdigest()
+
+    if upload_key is not None:
+        fingerprint_cache.put(upload_key, fingerprint)
+    return fingerprint
+
+
+def load_csv(file_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_csv (function): Function that returns the Pandas DataFrame parsed from a CSV file, reading it only if no file with the same content has been parsed before.
+    The parsed dataframe is stored in dataset_cache so that every tab and rerun shares the same object.
+    The first time a file is parsed, a Parquet snapshot and an Arrow IPC file are written (see utils.storage), and later loads in another process or after an eviction read them instead of the CSV file.
+    The returned dataframe is memory-mapped from the Arrow file whenever it could be written, so that its columns are shared through the page cache rather than copied in every process.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str or UploadedFile): Path to a CSV file or file-like object returned by Streamlit file_uploader
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Content hash of the file and parsed Pandas DataFrame
+
+    """
+    fingerprint = get_fingerprint(file_path)
+    df = dataset_cache.get(fingerprint)
+    if df is None:
+        df = read_store(fingerprint)
+        if df is None:
+            df = read_snapshot(fingerprint)
+            if df is None:
+                if hasattr(file_path, "seek"):
+                    file_path.seek(0)
+                df = pd.read_csv(file_path, on_bad_lines="skip")
+                write_snapshot(fingerprint, df)
+            # Map the dataframe from the Arrow file rather than keeping a private copy of it
+            if write_store(fingerprint, df):
+                mapped = read_store(fingerprint)
+                df = mapped if mapped is not None else df
+        df.attrs["fingerprint"] = fingerprint
+        dataset_cache.put(fingerprint, df)
+    return fingerprint, df
+
+
+def load_optimized_csv(file_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_optimized_csv (function): Function that returns the dataframe of load_csv with every column converted to a smaller data type by utils.dtypes.optimize_dtypes.
+    The converted dataframe is stored in dataset_cache so that the conversion is only done once per file content.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str or UploadedFile): Path to a CSV file or file-like object returned by Streamlit file_uploader
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Content hash of the file and converted Pandas DataFrame
+
+    """
+    fingerprint, df = load_csv(file_path)
+    key = (fingerprint, "optimized")
+    optimized = dataset_cache.get(key)
+    if optimized is None:
+        optimized = optimize_dtypes(df)
+        dataset_cache.put(key, optimized)
+    return fingerprint, optimized
+
+
+def load_columns(file_path, include):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_columns (function): Function that returns a dataframe holding at least the columns of a CSV file of the requested data types, for the analyzers that only need some of them.
+    If the whole file is not already in dataset_cache but has a Parquet snapshot, only the matching columns are read, memory-mapped from the Arrow file if there is one
+    or from the snapshot otherwise, their types being found in the snapshot schema.
+    Otherwise the whole dataframe is returned (see load_csv).
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str or UploadedFile): Path to a CSV file or file-like object returned by Streamlit file_uploader
+    -> include (str or list): Data types of the columns needed, as accepted by pd.DataFrame.select_dtypes
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Content hash of the file and Pandas DataFrame
+
+    """
+    fingerprint = get_fingerprint(file_path)
+    if fingerprint not in dataset_cache:
+        dtypes = read_snapshot_dtypes(fingerprint)
+        if dtypes is not None:
+            columns = pd.DataFrame(columns=dtypes.index).astype(dtypes).select_dtypes(include=include).columns.tolist()
+            key = (fingerprint, tuple(columns))
+            df = dataset_cache.get(key)
+            if df is None:
+                df = read_store(fingerprint, columns=columns)
+            if df is None:
+                df = read_snapshot(fingerprint, columns=columns)
+            if df is not None:
+                df.attrs["fingerprint"] = fingerprint
+                dataset_cache.put(key, df)
+                return fingerprint, df
+    return load_csv(file_path)
+
+
+def get_profile_key(analyzer, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_profile_key (function): Function that builds the profile_cache key of a column analyzed by NumericColumn, TextColumn or DateColumn.
+    The dataset fingerprint is read from the attrs of the analyzer dataframe, which is set by load_csv.
+
+    --------------------
+    Parameters
+    --------------------
+    -> analyzer (object): Instance of NumericColumn, TextColumn or DateColumn
+    -> col_name (str): Name of the profiled column
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Key built by make_profile_key, or None if the analyzer has no dataframe or its dataframe has no fingerprint
+
+    """
+    if analyzer.df is None:
+        return None
+    return make_profile_key(analyzer.df, col_name, type(analyzer).__name__)
+
+
+def make_profile_key(df, col_name, analyzer_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_profile_key (function): Function that builds the profile_cache key of a column of a dataframe profiled by an analyzer.
+    The key tells whether the data types of the dataframe have been optimized (see utils.dtypes.optimize_dtypes), as the profile of an optimized column can differ
+    (downcast floats, categories), in the same way as tab_df.logics.Dataset.get_profile_name.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe holding the column
+    -> col_name (str): Name of the profiled column
+    -> analyzer_name (str): Name of the analyzer class: NumericColumn, TextColumn, DateColumn or Dataset
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Dataset fingerprint, column name, analyzer type and optimization flag, or None if the dataframe has no fingerprint
+
+    """
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is None:
+        return None
+    return (fingerprint, col_name, analyzer_name, "optimization" in df.attrs)
+
+
+def load_profile(analyzer, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_profile (function): Function that restores the attributes previously computed by set_data() for a column, if they are in profile_cache.
+
+    --------------------
+    Parameters
+    --------------------
+    -> analyzer (object): Instance of NumericColumn, TextColumn or DateColumn
+    -> col_name (str): Name of the profiled column
+
+    --------------------
+    Returns
+    --------------------
+    -> (bool): True if the profile was found and restored, False otherwise
+
+    """
+    key = get_profile_key(analyzer, col_name)
+    if key is None:
+        return False
+    profile = profile_cache.get(key)
+    if profile is None:
+        return False
+    analyzer.__dict__.update(profile)
+    return True
+
+
+def save_profile(analyzer, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> save_profile (function): Function that stores in profile_cache the attributes computed by set_data() for a column.
+    Attributes describing the whole dataset and the converted column (PROFILE_SKIPPED_ATTRIBUTES) are not stored, so that the size of a profile does not grow with the number of rows.
+
+    --------------------
+    Parameters
+    --------------------
+    -> analyzer (object): Instance of NumericColumn, TextColumn or DateColumn
+    -> col_name (str): Name of the profiled column
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    key = get_profile_key(analyzer, col_name)
+    if key is not None:
+        profile = {
+            name: value for name, value in analyzer.__dict__.items()
+            if name not in PROFILE_SKIPPED_ATTRIBUTES
+        }
+        profile_cache.put(key, profile)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+# Data types of the columns analyzed as numbers: int64 and float64 as parsed by read_csv, and the smaller types produced by optimize_dtypes
+NUM_DTYPES = ["integer", "floating"]
+
+# Data types of the columns analyzed as text: object as parsed by read_csv, string for Arrow-backed strings and category for the columns converted by optimize_dtypes
+TEXT_DTYPES = ["object", "string", "category"]
+
+# Number of rows sampled to estimate the memory used by the Python objects of object columns
+MEMORY_SAMPLE_ROWS = 10000
+
+# Text columns whose number of unique values is at most this fraction of their rows are converted to category by optimize_dtypes
+CATEGORY_MAX_RATIO = 0.5
+
+
+def get_memory_usage(df, exact=False, sample_rows=MEMORY_SAMPLE_ROWS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_memory_usage (function): Function that returns the memory used by each column of a dataframe, as df.memory_usage(deep=True) without the index.
+    Measuring object columns exactly means measuring every Python object they hold, so unless exact is True, the size of these objects is estimated
+    from a random sample of sample_rows rows and extrapolated to all rows. The other columns are always measured exactly, which is cheap.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be measured
+    -> exact (bool): Whether to measure every object instead of a sample (default set to False)
+    -> sample_rows (int): Number of rows sampled to estimate the object columns
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Memory usage in bytes of each column
+    """
+    object_cols = df.columns[df.dtypes == object]
+    if exact or len(df) <= sample_rows or not len(object_cols):
+        return df.memory_usage(index=False, deep=True)
+
+    memory_usage = df.memory_usage(index=False, deep=False)
+    other_cols = df.columns.difference(object_cols, sort=False)
+    memory_usage[other_cols] = df[other_cols].memory_usage(index=False, deep=True)
+
+    # Extrapolate the size of the Python objects from the sample, on top of the exact size of the array of pointers
+    sample = df[object_cols].sample(n=sample_rows, random_state=0)
+    objects_size = sample.memory_usage(index=False, deep=True) - sample.memory_usage(index=False, deep=False)
+    memory_usage[object_cols] += (objects_size * len(df) / sample_rows).round().astype("int64")
+    return memory_usage
+
+
+def optimize_serie(serie, category_max_ratio=CATEGORY_MAX_RATIO):
+    """
+    --------------------
+    Description
+    --------------------
+    -> optimize_serie (function): Function that converts a column to the smallest data type that holds the same values:
+    integers are downcast to the smallest integer type, floats to float32 when no value changes, text columns with few unique values to category
+    and the other text columns to Arrow-backed strings (when pyarrow is installed). Other columns are returned unchanged.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Column to be converted
+    -> category_max_ratio (float): Maximum ratio of unique values to rows for a text column to be converted to category
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Converted column
+    """
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        return serie
+
+    if pd.api.types.is_integer_dtype(serie.dtype) and serie.dtype.kind in "iu":
+        if len(serie) and serie.min() >= 0:
+            return pd.to_numeric(serie, downcast="unsigned")
+        return pd.to_numeric(serie, downcast="integer")
+
+    if pd.api.types.is_float_dtype(serie.dtype) and serie.dtype.kind == "f":
+        converted = serie.astype("float32")
+        if np.array_equal(converted.to_numpy(dtype="float64"), serie.to_numpy(), equal_nan=True):
+            return converted
+        return serie
+
+    if serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype):
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie
+        if serie.nunique(dropna=False) <= category_max_ratio * len(serie):
+            return serie.astype("category")
+        if serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) == "string":
+            try:
+                import pyarrow as pa
+                return serie.astype(pd.ArrowDtype(pa.string()))
+            except ImportError:
+                return serie
+    return serie
+
+
+def optimize_dtypes(df, category_max_ratio=CATEGORY_MAX_RATIO):
+    """
+    --------------------
+    Description
+    --------------------
+    -> optimize_dtypes (function): Function that converts every column of a dataframe with optimize_serie to reduce the memory it uses.
+    The data type and memory usage (estimated as by get_memory_usage) of each column before the conversion are kept in the "optimization" attrs of the returned dataframe
+    as a dataframe indexed by column name with the columns Original Data Type and Original Memory Usage, so that tab_df.logics.Dataset can report them.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be converted
+    -> category_max_ratio (float): Maximum ratio of unique values to rows for a text column to be converted to category
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Converted dataframe
+    """
+    optimized = pd.DataFrame(
+        {col: optimize_serie(df[col], category_max_ratio) for col in df.columns},
+        index=df.index,
+    )
+    optimized.attrs = dict(df.attrs)
+    optimized.attrs["optimization"] = pd.DataFrame({
+        "Original Data Type": df.dtypes.astype(str),
+        "Original Memory Usage": get_memory_usage(df),
+    })
+    return optimized
@@ -0,0 +1,658 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Above this number of rows, count_distinct() uses a HyperLogLog when the approximate mode is automatic
+APPROX_DISTINCT_ROWS = 5000000
+
+# Number of values hashed at once by HyperLogLog.update()
+HASH_BLOCK_SIZE = 1000000
+
+# Above this number of distinct values, the most frequent values are found with a FrequentItems summary instead of a full value_counts()
+EXACT_FREQUENT_DISTINCT = 100000
+
+
+class QuantileSketch:
+    """
+    --------------------
+    Description
+    --------------------
+    -> QuantileSketch (class): Class that estimates quantiles of a stream of numeric values in bounded memory (KLL sketch, Karnin, Lang and Liberty 2016).
+    Values are kept in levels of compactors where an item of level h stands for 2**h values. When a level is full it is sorted
+    and every other item (with a random offset) is promoted to the next level, so memory grows with log(n) instead of n.
+    Two sketches can be merged, which allows chunks or workers to be sketched separately.
+
+    --------------------
+    Attributes
+    --------------------
+    -> error (float): Targeted normalized rank error of the estimated quantiles (default set to 0.01)
+    -> k (int): Capacity of the top level compactor, derived from error
+    -> levels (list): NumPy arrays of the items kept at each level
+    -> count (int): Number of values seen (default set to 0)
+    -> rng (np.random.Generator): Random generator used to pick the promoted items, seeded so that results are reproducible
+
+    """
+    def __init__(self, error=0.01, seed=0):
+        self.error = error
+        self.k = max(8, int(math.ceil(3.3 / error)))
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+    def get_capacity(self, level):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_capacity (method): Class method that returns the number of items a level can hold before being compacted. Lower levels hold geometrically fewer items.
+
+        --------------------
+        Parameters
+        --------------------
+        -> level (int): Level of the compactor
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Capacity of the level
+
+        """
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values, block_size=65536):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds an array of values to the sketch, ignoring missing values.
+        Values are added block by block so that the lowest level stays small.
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (np.ndarray): Numeric values, missing values as NaN
+        -> block_size (int): Number of values added at once
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        for start in range(0, len(values), block_size):
+            block = values[start:start + block_size]
+            self.levels[0] = np.concatenate([self.levels[0], block])
+            self.count += len(block)
+            self.compress()
+
+    def compress(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> compress (method): Class method that compacts every level holding more items than its capacity, adding a level on top when needed.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.get_capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level so that the total weight is preserved
+                kept = items[len(items) - len(items) % 2:]
+                offset = int(self.rng.integers(2))
+                promoted = items[offset:len(items) - len(items) % 2:2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Adding a level lowers the capacity of the levels below, so start again from the bottom
+                level = 0
+            else:
+                level += 1
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another sketch into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (QuantileSketch): Sketch of other values
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.compress()
+
+    def get_quantile(self, q):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_quantile (method): Class method that estimates the value below which a fraction q of the values fall.
+
+        --------------------
+        Parameters
+        --------------------
+        -> q (float or list): Fraction between 0 and 1, or list of fractions
+
+        --------------------
+        Returns
+        --------------------
+        -> (float or np.ndarray): Estimated quantile(s), NaN if the sketch is empty
+
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype="float64") * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[positions]
+
+    def get_median(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_median (method): Class method that estimates the median of the values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (float): Estimated median, NaN if the sketch is empty
+
+        """
+        return float(self.get_quantile(0.5))
+
+
+class HyperLogLog:
+    """
+    --------------------
+    Description
+    --------------------
+    -> HyperLogLog (class): Class that estimates the number of distinct values of a stream in fixed memory (HyperLogLog, Flajolet et al. 2007).
+    Each value is hashed to 64 bits, the first bits select one of 2**precision registers and each register keeps the longest run of leading zeros seen in the remaining bits.
+    The relative standard error is about 1.04 / sqrt(2**precision), 0.8% with the default precision.
+    Two sketches with the same precision can be merged.
+
+    --------------------
+    Attributes
+    --------------------
+    -> precision (int): Number of bits selecting the register, between 11 and 18 (default set to 14)
+    -> registers (np.ndarray): Longest run of leading zeros (plus one) seen by each register
+
+    """
+    def __init__(self, precision=14):
+        if not 11 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 11 and 18")
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype="uint8")
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds values to the sketch, ignoring missing values. Values are hashed block by block to bound the memory used.
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series or np.ndarray): Values to be counted
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = pd.Series(values, copy=False) if not isinstance(values, pd.Series) else values
+        for start in range(0, len(values), HASH_BLOCK_SIZE):
+            block = values.iloc[start:start + HASH_BLOCK_SIZE].dropna()
+            if len(block):
+                hashes = pd.util.hash_array(block.to_numpy(), categorize=False)
+                self.update_hashes(hashes)
+
+    def update_hashes(self, hashes):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update_hashes (method): Class method that adds 64-bit hashes to the registers.
+
+        --------------------
+        Parameters
+        --------------------
+        -> hashes (np.ndarray): Array of uint64 hashes
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        n_bits = 64 - self.precision
+        index = (hashes >> np.uint64(n_bits)).astype("int64")
+        remainder = hashes & np.uint64((1 << n_bits) - 1)
+        # The remainder has at most 53 bits, so its float conversion and exponent are exact
+        _, exponent = np.frexp(remainder.astype("float64"))
+        rank = (n_bits + 1 - exponent).astype("uint8")
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another sketch with the same precision into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (HyperLogLog): Sketch of other values
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLog sketches with the same precision can be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def get_count(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_count (method): Class method that estimates the number of distinct values added, using linear counting for small cardinalities.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Estimated number of distinct values
+
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype("int64")))
+        n_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and n_zeros:
+            estimate = m * math.log(m / n_zeros)
+        return int(round(estimate))
+
+
+def count_distinct(serie, approximate=None, precision=14):
+    """
+    --------------------
+    Description
+    --------------------
+    -> count_distinct (function): Function that counts the distinct non missing values of a series, exactly with Series.nunique() or approximately with a HyperLogLog.
+    The approximate count avoids building a hash set of every distinct value, which is the largest memory spike on high-cardinality columns.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Series to be counted
+    -> approximate (bool): True to use a HyperLogLog, False to count exactly, None to only approximate series longer than APPROX_DISTINCT_ROWS (default set to None)
+    -> precision (int): Precision of the HyperLogLog
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Number of distinct non missing values
+
+    """
+    if approximate is None:
+        approximate = len(serie) > APPROX_DISTINCT_ROWS
+    if not approximate:
+        return serie.nunique()
+    sketch = HyperLogLog(precision=precision)
+    sketch.update(serie)
+    return sketch.get_count()
+
+
+class FrequentItems:
+    """
+    --------------------
+    Description
+    --------------------
+    -> FrequentItems (class): Class that keeps the most frequent values of a stream in bounded memory (Space-Saving summary, Metwally et al. 2005, merged as in Agarwal et al. 2012).
+    At most capacity values are kept with an upper bound of their number of occurrences and the maximum error of that bound.
+    Any value that is not kept occurred at most floor times. Values are fed as the exact value counts of chunks, so memory is bounded by the chunk size and capacity.
+    Two summaries can be merged.
+
+    --------------------
+    Attributes
+    --------------------
+    -> capacity (int): Maximum number of values kept (default set to 1000)
+    -> counts (pd.Series): Upper bound of the number of occurrences of each kept value
+    -> errors (pd.Series): Maximum overestimation of each count, so that the true count is between counts - errors and counts
+    -> floor (int): Upper bound of the number of occurrences of any value that is not kept (default set to 0)
+    -> n_rows (int): Number of values seen (default set to 0)
+
+    """
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.errors = pd.Series(dtype="int64")
+        self.floor = 0
+        self.n_rows = 0
+
+    def update(self, values, block_size=HASH_BLOCK_SIZE):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds values to the summary, block by block, ignoring missing values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series): Values to be counted
+        -> block_size (int): Number of values counted at once
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        for start in range(0, len(values), block_size):
+            self.update_counts(values.iloc[start:start + block_size].value_counts())
+
+    def update_counts(self, counts):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update_counts (method): Class method that adds the exact value counts of a chunk to the summary.
+
+        --------------------
+        Parameters
+        --------------------
+        -> counts (pd.Series): Number of occurrences of each distinct value of the chunk
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        other = FrequentItems(capacity=self.capacity)
+        other.counts = counts.astype("int64")
+        other.errors = pd.Series(0, index=counts.index, dtype="int64")
+        other.n_rows = int(counts.sum())
+        other.truncate()
+        self.merge(other)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another summary into this one. A value missing from one summary is counted with that summary floor.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (FrequentItems): Summary of other values
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        index = self.counts.index.union(other.counts.index)
+        self.counts = (
+            self.counts.reindex(index, fill_value=self.floor)
+            + other.counts.reindex(index, fill_value=other.floor)
+        )
+        self.errors = (
+            self.errors.reindex(index, fill_value=self.floor)
+            + other.errors.reindex(index, fill_value=other.floor)
+        )
+        self.floor += other.floor
+        self.n_rows += other.n_rows
+        self.truncate()
+
+    def truncate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> truncate (method): Class method that only keeps the capacity values with the largest counts and raises floor to the largest dropped count.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if len(self.counts) > self.capacity:
+            self.counts = self.counts.sort_values(ascending=False, kind="stable")
+            self.floor = max(self.floor, int(self.counts.iloc[self.capacity]))
+            self.counts = self.counts.iloc[:self.capacity]
+            self.errors = self.errors.reindex(self.counts.index)
+
+    def get_top(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top (method): Class method that returns the most frequent values with their estimated number of occurrences.
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of values returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns value, occurrence and max_error, sorted by decreasing occurrence
+
+        """
+        counts = self.counts.sort_values(ascending=False, kind="stable").head(end)
+        return pd.DataFrame({
+            "value": counts.index,
+            "occurrence": counts.values,
+            "max_error": self.errors.reindex(counts.index).values,
+        })
+
+
+class ValueCounter:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ValueCounter (class): Class that counts the values of a column chunk by chunk, exactly while it has at most max_exact distinct values
+    and then with a HyperLogLog for the number of distinct values and a FrequentItems summary for the most frequent ones, so that memory stays bounded on high-cardinality columns.
+    Two counters can be merged.
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_exact (int): Maximum number of distinct values counted exactly (default set to 100000)
+    -> counts (pd.Series): Exact number of occurrences of each distinct value, None once the counter is approximate
+    -> distinct (HyperLogLog): Sketch of the distinct values, None while the counter is exact
+    -> frequent (FrequentItems): Summary of the most frequent values, None while the counter is exact
+
+    """
+    def __init__(self, max_exact=100000):
+        self.max_exact = max_exact
+        self.counts = pd.Series(dtype="int64")
+        self.distinct = None
+        self.frequent = None
+
+    def is_exact(self):
+        return self.counts is not None
+
+    def update_counts(self, counts):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update_counts (method): Class method that adds the exact value counts of a chunk, switching to approximate counting when there are too many distinct values.
+
+        --------------------
+        Parameters
+        --------------------
+        -> counts (pd.Series): Number of occurrences of each distinct value of the chunk
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.is_exact():
+            self.counts = self.counts.add(counts, fill_value=0).astype("int64")
+            if len(self.counts) > self.max_exact:
+                self.set_approximate()
+        else:
+            self.distinct.update(counts.index.to_series())
+            self.frequent.update_counts(counts)
+
+    def set_approximate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_approximate (method): Class method that moves the exact counts into a HyperLogLog and a FrequentItems summary and drops them.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.is_exact():
+            self.distinct = HyperLogLog()
+            self.frequent = FrequentItems()
+            if len(self.counts):
+                self.distinct.update(self.counts.index.to_series())
+                self.frequent.update_counts(self.counts)
+            self.counts = None
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that combines another counter of the same column into this one.
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (ValueCounter): Counter of other chunks of the column
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if other.is_exact():
+            self.update_counts(other.counts)
+            return
+        self.set_approximate()
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+
+    def get_n_unique(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_n_unique (method): Class method that returns the number of distinct values, exact or estimated.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Number of distinct values
+
+        """
+        if self.is_exact():
+            return len(self.counts)
+        return self.distinct.get_count()
+
+    def get_top(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top (method): Class method that returns the most frequent values. An estimated count also has a max_error column.
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of values returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns value and occurrence (and max_error when approximate), sorted by decreasing occurrence
+
+        """
+        if not self.is_exact():
+            return self.frequent.get_top(end)
+        counts = self.counts.sort_values(ascending=False, kind="stable").head(end)
+        return pd.DataFrame({"value": counts.index, "occurrence": counts.values})
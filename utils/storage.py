@@ -0,0 +1,321 @@
+import os
+import tempfile
+
+import pandas as pd
+
+# Directory where the columnar snapshots of the parsed CSV files are written
+SNAPSHOT_DIR = os.environ.get("CSV_EXPLORER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "csv_explorer"))
+
+# Maximum total bytes of the snapshots and Arrow files kept in SNAPSHOT_DIR, the least recently used ones being deleted first
+SNAPSHOT_DIR_BYTES = 8 * 1024 ** 3
+
+# Extensions of the files managed in SNAPSHOT_DIR
+SNAPSHOT_EXTENSIONS = (".parquet", ".arrow")
+
+# Compression codec of the Parquet snapshots
+SNAPSHOT_COMPRESSION = "zstd"
+
+# Errors raised when pyarrow is not installed, the cache directory is not writable or a column cannot be stored in Parquet
+# (pyarrow ArrowInvalid and ArrowTypeError derive from ValueError and TypeError)
+SNAPSHOT_ERRORS = (ImportError, OSError, ValueError, TypeError)
+
+
+def get_snapshot_path(fingerprint):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_snapshot_path (function): Function that returns the path of the Parquet snapshot of a CSV file in SNAPSHOT_DIR.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Path of the snapshot
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{fingerprint}.parquet")
+
+
+def get_temp_path(path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_temp_path (function): Function that creates an empty temporary file next to a file of SNAPSHOT_DIR, with a unique name so that
+    concurrent writes of the same file from several threads or processes never share it.
+
+    --------------------
+    Parameters
+    --------------------
+    -> path (str): Path of the file to be written
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Path of the temporary file
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=SNAPSHOT_DIR)
+    os.close(fd)
+    return temp_path
+
+
+def touch_file(path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> touch_file (function): Function that sets the modification time of a file of SNAPSHOT_DIR to now, so that evict_files() sees it as recently used.
+
+    --------------------
+    Parameters
+    --------------------
+    -> path (str): Path of the file
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_files(max_bytes=SNAPSHOT_DIR_BYTES):
+    """
+    --------------------
+    Description
+    --------------------
+    -> evict_files (function): Function that deletes the least recently used snapshots and Arrow files of SNAPSHOT_DIR until their total size is at most max_bytes.
+    Files are ranked by modification time, which write_snapshot, write_store, read_snapshot and read_store refresh. The most recent file is always kept.
+    A deleted Arrow file stays readable by the processes that have already memory-mapped it.
+
+    --------------------
+    Parameters
+    --------------------
+    -> max_bytes (int): Maximum total bytes of the files
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Number of deleted files
+    """
+    files = []
+    try:
+        with os.scandir(SNAPSHOT_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(SNAPSHOT_EXTENSIONS):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return 0
+
+    files.sort(reverse=True)
+    total = 0
+    n_deleted = 0
+    for position, (_, size, path) in enumerate(files):
+        total += size
+        if total > max_bytes and position > 0:
+            try:
+                os.remove(path)
+                n_deleted += 1
+            except OSError:
+                pass
+    return n_deleted
+
+
+def write_snapshot(fingerprint, df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> write_snapshot (function): Function that writes a parsed dataframe as a compressed Parquet snapshot, so that the next loads of a file with the same content
+    do not have to parse the CSV again. The file is written under a temporary name and then renamed, so that a concurrent session never reads a partial snapshot.
+    The least recently used files of SNAPSHOT_DIR are then deleted to keep it under SNAPSHOT_DIR_BYTES (see evict_files). Nothing is written if pyarrow is not installed or if the dataframe cannot be stored.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+    -> df (pd.DataFrame): Parsed dataframe
+
+    --------------------
+    Returns
+    --------------------
+    -> (bool): True if the snapshot has been written, False otherwise
+    """
+    path = get_snapshot_path(fingerprint)
+    temp_path = None
+    try:
+        temp_path = get_temp_path(path)
+        df.to_parquet(temp_path, engine="pyarrow", compression=SNAPSHOT_COMPRESSION, index=False)
+        os.replace(temp_path, path)
+    except SNAPSHOT_ERRORS:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    evict_files()
+    return True
+
+
+def read_snapshot(fingerprint, columns=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_snapshot (function): Function that reads the Parquet snapshot of a CSV file, optionally only some of its columns.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+    -> columns (list): Names of the columns to be read (default set to None for all columns)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Snapshot dataframe, or None if there is no readable snapshot
+    """
+    path = get_snapshot_path(fingerprint)
+    if not os.path.exists(path):
+        return None
+    touch_file(path)
+    try:
+        return pd.read_parquet(path, engine="pyarrow", columns=columns)
+    except SNAPSHOT_ERRORS:
+        return None
+
+
+def read_snapshot_dtypes(fingerprint):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_snapshot_dtypes (function): Function that returns the Pandas data type of every column of a snapshot from its Parquet schema, without reading any row.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Data type of each column, or None if there is no readable snapshot
+    """
+    path = get_snapshot_path(fingerprint)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).empty_table().to_pandas().dtypes
+    except SNAPSHOT_ERRORS:
+        return None
+
+
+def get_store_path(fingerprint):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_store_path (function): Function that returns the path of the uncompressed Arrow IPC file of a CSV file in SNAPSHOT_DIR, which is memory-mapped by read_store.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Path of the Arrow file
+    """
+    return os.path.join(SNAPSHOT_DIR, f"{fingerprint}.arrow")
+
+
+def write_store(fingerprint, df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> write_store (function): Function that writes a parsed dataframe as an uncompressed Arrow IPC file that read_store can memory-map.
+    Missing float values are kept as NaN rather than Arrow nulls so that float columns can be mapped without copy.
+    As write_snapshot, the file is written under a temporary name and then renamed, SNAPSHOT_DIR is kept under SNAPSHOT_DIR_BYTES, and nothing is written if pyarrow is not installed or if the dataframe cannot be stored.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+    -> df (pd.DataFrame): Parsed dataframe
+
+    --------------------
+    Returns
+    --------------------
+    -> (bool): True if the file has been written, False otherwise
+    """
+    path = get_store_path(fingerprint)
+    temp_path = None
+    try:
+        import pyarrow as pa
+        arrays = [
+            pa.array(df[col].to_numpy(), from_pandas=df[col].dtype.kind != "f")
+            for col in df.columns
+        ]
+        table = pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+        temp_path = get_temp_path(path)
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+    except SNAPSHOT_ERRORS:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    evict_files()
+    return True
+
+
+def read_store(fingerprint, columns=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_store (function): Function that memory-maps the Arrow IPC file of a CSV file and returns it as a Pandas DataFrame without copying its data.
+    Numeric columns are read-only NumPy views and text columns are Arrow-backed strings (pd.ArrowDtype) over the mapped file,
+    so the operating system pages the columns in when they are used and every session reading the same file shares the same page cache.
+
+    --------------------
+    Parameters
+    --------------------
+    -> fingerprint (str): Content hash of the CSV file
+    -> columns (list): Names of the columns to be read (default set to None for all columns)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Memory-mapped dataframe, or None if there is no readable Arrow file
+    """
+    path = get_store_path(fingerprint)
+    if not os.path.exists(path):
+        return None
+    touch_file(path)
+    try:
+        import pyarrow as pa
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas(
+            split_blocks=True,
+            types_mapper=lambda arrow_type: pd.ArrowDtype(arrow_type) if pa.types.is_string(arrow_type) else None,
+        )
+    except SNAPSHOT_ERRORS:
+        return None